@@ -1,17 +1,24 @@
-from flask import Flask, request, jsonify, Blueprint
+from flask import Flask, request, jsonify, Blueprint, Response, send_file
 from resume_analyzer import AIResumeAnalyzer
 from resume_job_matcher import ResumeJobMatcher
 from flask_cors import CORS
-from job_recommendation import get_job_listings
+from job_recommendation import (
+    get_job_listings, get_job_page, iter_job_pages, prefetch_job_pages, get_job_search_cache_stats,
+    JobSearchUnavailable, RESULTS_PER_PAGE, MAX_RESULTS_PER_PAGE, JOB_SEARCH_MAX_PREFETCH,
+)
+from job_ranking import rank_jobs, RANKING_METHODS, JOB_RANKING_METHOD
+from pdf_extraction import extract_pdf
+from resume_job_matcher import SCORING_MODES
+from llm_schemas import LLM_OUTPUT_MODES, LLM_OUTPUT_MODE
+from resume_index import get_resume_index, index_resume
+from embedding_scorer import get_embedding_scorer
 import os
-import requests
 import json
 from fpdf import FPDF
 from datetime import datetime
 import math
 import logging
 import re
-import PyPDF2
 import uuid
 from dotenv import load_dotenv
 from cloudinary.uploader import upload
@@ -19,7 +26,16 @@ from cloudinary import config, api
 from cloudinary.utils import cloudinary_url
 from io import BytesIO
 import time
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_client import http_get, http_head
+from job_queue import get_job_queue, is_allowed_callback, JobError
+from urllib.parse import urlparse, parse_qs, urlencode
+import hashlib
+import base64
+from disk_cache import get_cache
+from llm_cache import get_llm_cache_stats
+from report_assets import report_assets
 
 load_dotenv()
 
@@ -28,6 +44,8 @@ config(
     cloud_name=os.environ.get('CLOUDINARY_CLOUD_NAME'),
     api_key=os.environ.get('CLOUDINARY_API_KEY'),
     api_secret=os.environ.get('CLOUDINARY_API_SECRET'),
+    # Point uploads at another Cloudinary-compatible API, e.g. the load-test stand-in
+    upload_prefix=os.environ.get('CLOUDINARY_UPLOAD_PREFIX'),
     secure=True
 )
 
@@ -41,7 +59,7 @@ CORS(app, resources={
         "origins": ["http://localhost:5173", "https://career-catalyst-six.vercel.app"],
         "methods": ["GET", "POST", "OPTIONS"],
         "allow_headers": ["Content-Type"],
-        "expose_headers": ["X-Report-FilePath"],
+        "expose_headers": ["X-Report-FilePath", "Content-Disposition"],
         "supports_credentials": True
     }
 })
@@ -49,32 +67,42 @@ CORS(app, resources={
 analyzer = AIResumeAnalyzer()
 matcher = ResumeJobMatcher()
 
+# Parse the bundled report images once per worker instead of for every report
+report_assets.load()
+
+MATCH_BATCH_MAX_RESUMES = int(os.environ.get('MATCH_BATCH_MAX_RESUMES', 500))
+MATCH_BATCH_WORKERS = int(os.environ.get('MATCH_BATCH_WORKERS', 8))
+MATCH_RERANK_TOP_K = int(os.environ.get('MATCH_RERANK_TOP_K', 10))
+
+# Resumes are only fetched from URLs under this prefix
+RESUME_URL_PREFIX = os.environ.get('RESUME_URL_PREFIX', 'https://res.cloudinary.com')
+
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_MAX_CONCURRENCY = int(os.environ.get('GITHUB_MAX_CONCURRENCY', 8))
+# Once this few requests are left in the rate-limit window, wait for the reset instead of fanning out
+GITHUB_RATE_LIMIT_RESERVE = int(os.environ.get('GITHUB_RATE_LIMIT_RESERVE', 50))
+GITHUB_RATE_LIMIT_MAX_WAIT = int(os.environ.get('GITHUB_RATE_LIMIT_MAX_WAIT', 30))
+# "fast" counts commits and PRs from result totals, "paginate" downloads and filters every object
+GITHUB_COUNT_STRATEGY = os.environ.get('GITHUB_COUNT_STRATEGY', 'fast')
+# The search API stops returning results after this many matches
+GITHUB_SEARCH_RESULT_LIMIT = 1000
+# Collected profiles are reused as-is for this long; after that every request is revalidated with its ETag.
+# 0 turns the profile cache off
+GITHUB_PROFILE_CACHE_TTL = int(os.environ.get('GITHUB_PROFILE_CACHE_TTL', 3600))
+GITHUB_CACHE_MAX_BYTES = int(os.environ.get('GITHUB_CACHE_MAX_BYTES', 128 * 1024 * 1024))
+
+# "metadata" trusts the byte count in Cloudinary's upload response, "head" also checks the public URL, "none" skips it
+REPORT_VERIFY_MODE = os.environ.get('REPORT_VERIFY_MODE', 'metadata')
+
 report_bp = Blueprint('report', __name__, url_prefix='/report')
 
 def extract_pdf_text_and_links(pdf_file):
     logger.debug("Starting PDF text and hyperlink extraction")
     try:
         pdf_file.seek(0)
-        reader = PyPDF2.PdfReader(pdf_file)
-        extracted_text = []
-        for page_num, page in enumerate(reader.pages):
-            logger.debug(f"Processing page {page_num + 1}")
-            page_text = page.extract_text() or ""
-            if page_text:
-                extracted_text.append(page_text)
-            if "/Annots" in page:
-                annotations = page["/Annots"]
-                for annot in annotations:
-                    annot_obj = annot.get_object()
-                    if annot_obj.get("/Subtype") == "/Link" and "/A" in annot_obj:
-                        action = annot_obj["/A"]
-                        if "/URI" in action:
-                            uri = action["/URI"]
-                            logger.debug(f"Found hyperlink: {uri}")
-                            extracted_text.append(uri)
-        combined_text = "\n".join(extracted_text)
+        extraction = extract_pdf(pdf_file.read())
+        combined_text = "\n".join(part for part in [extraction["text"]] + extraction["links"] if part)
         if not combined_text.strip():
-            logger.warning("No text or hyperlinks extracted from PDF")
             return ""
         logger.debug(f"Extracted text and hyperlinks: {combined_text[:100]}...")
         return combined_text
@@ -88,19 +116,126 @@ def get_github_token():
         raise ValueError("GitHub token not found in environment variables")
     return token
 
-def github_api_request(endpoint, token, params=None):
-    base_url = "https://api.github.com"
+class GitHubRateLimiter:
+    """Bounds concurrent GitHub requests and holds them back when the rate limit is nearly spent"""
+
+    def __init__(self, max_concurrency, reserve, max_wait):
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.remaining = None
+        self.reset_at = None
+
+    def update(self, headers):
+        # The search API has its own, much smaller budget; only track the core limit
+        if headers.get("X-RateLimit-Resource", "core") != "core":
+            return
+        with self._lock:
+            if headers.get("X-RateLimit-Remaining") is not None:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if headers.get("X-RateLimit-Reset") is not None:
+                self.reset_at = int(headers["X-RateLimit-Reset"])
+
+    def _wait_for_budget(self):
+        with self._lock:
+            remaining, reset_at = self.remaining, self.reset_at
+        if remaining is None or remaining > self.reserve or reset_at is None:
+            return
+        wait = reset_at - time.time()
+        if wait > self.max_wait:
+            raise Exception(f"GitHub rate limit nearly exhausted ({remaining} requests left, resets in {int(wait)}s)")
+        if wait > 0:
+            logger.warning(f"GitHub rate limit low ({remaining} requests left), waiting {wait:.1f}s for reset")
+            time.sleep(wait)
+
+    def __enter__(self):
+        self._wait_for_budget()
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+
+github_rate_limiter = GitHubRateLimiter(GITHUB_MAX_CONCURRENCY, GITHUB_RATE_LIMIT_RESERVE, GITHUB_RATE_LIMIT_MAX_WAIT)
+
+class GitHubAPIError(Exception):
+    """A GitHub API request answered with an unexpected status"""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+def github_api_response(endpoint, token, params=None, etag=None):
+    base_url = GITHUB_API_URL
     headers = {"Authorization": f"Bearer {token}", "User-Agent": "Mozilla/5.0"}
-    response = requests.get(f"{base_url}{endpoint}", headers=headers, params=params)
+    if etag:
+        headers["If-None-Match"] = etag
+    with github_rate_limiter:
+        response = http_get(f"{base_url}{endpoint}", headers=headers, params=params)
+    github_rate_limiter.update(response.headers)
     remaining = response.headers.get("X-RateLimit-Remaining")
     logger.debug(f"Rate limit remaining: {remaining}")
+    if response.status_code == 304 and etag:
+        return response
     if response.status_code == 403:
-        raise Exception("Rate limit exceeded or insufficient permissions.")
+        raise GitHubAPIError("Rate limit exceeded or insufficient permissions.", 403)
     if response.status_code != 200:
-        raise Exception(f"API request failed with status {response.status_code}: {response.text}")
-    return response.json()
+        raise GitHubAPIError(f"API request failed with status {response.status_code}: {response.text}", response.status_code)
+    return response
+
+def github_cached_get(endpoint, token, params=None):
+    """GET a GitHub resource, revalidating any cached copy with If-None-Match; returns (body, links)"""
+    # 304 responses do not count against the rate limit
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+    cache_key = f"{token_hash}:{endpoint}?{urlencode(sorted((params or {}).items()))}"
+    cache = get_cache("github", GITHUB_CACHE_MAX_BYTES)
+    cached = cache.get(cache_key)
+    response = github_api_response(endpoint, token, params, etag=cached["etag"] if cached else None)
+    if response.status_code == 304:
+        logger.debug(f"GitHub resource not modified: {endpoint}")
+        return cached["body"], cached["links"]
+    body = response.json()
+    if response.headers.get("ETag"):
+        cache.set(cache_key, {"etag": response.headers["ETag"], "body": body, "links": response.links})
+    return body, response.links
 
-def fetch_commit_count(username, repo_name, token):
+def github_api_request(endpoint, token, params=None):
+    return github_cached_get(endpoint, token, params)[0]
+
+def count_from_last_page(body, links):
+    # With per_page=1 the number of the last page in the Link header is the total item count
+    last_link = links.get("last")
+    if last_link:
+        return int(parse_qs(urlparse(last_link["url"]).query)["page"][0])
+    return len(body)
+
+def count_commits_by_author(username, repo_name, token):
+    body, links = github_cached_get(
+        f"/repos/{username}/{repo_name}/commits",
+        token,
+        params={"author": username, "per_page": 1}
+    )
+    return count_from_last_page(body, links)
+
+def is_empty_repository(error):
+    # GitHub answers 409 Conflict for the commits of a repository that has none
+    return isinstance(error, GitHubAPIError) and error.status_code == 409
+
+def fetch_commit_count(username, repo_name, token, failures=None):
+    if GITHUB_COUNT_STRATEGY == "fast":
+        try:
+            commit_count = count_commits_by_author(username, repo_name, token)
+            logger.debug(f"User {username} made {commit_count} commits in repo {repo_name}")
+            return commit_count
+        except Exception as e:
+            if is_empty_repository(e):
+                logger.debug(f"Repo {repo_name} is empty")
+                return 0
+            logger.warning(f"Fast commit count failed for repo {repo_name}, paginating instead: {e}")
+    return fetch_commit_count_paginated(username, repo_name, token, failures)
+
+def fetch_commit_count_paginated(username, repo_name, token, failures=None):
     commit_count = 0
     page = 1
     while True:
@@ -121,14 +256,40 @@ def fetch_commit_count(username, repo_name, token):
             if len(commits) < 100:  # No more commits to fetch
                 break
             page += 1
-            time.sleep(0.1)  # Avoid hitting rate limits
         except Exception as e:
+            if is_empty_repository(e):
+                logger.debug(f"Repo {repo_name} is empty")
+                break
             logger.error(f"Error fetching commits for repo {repo_name}: {e}")
+            if failures is not None:
+                failures.append(f"commits of {repo_name}: {e}")
             break
     logger.debug(f"User {username} made {commit_count} commits in repo {repo_name}")
     return commit_count
 
-def fetch_pull_request_count(username, repo_name, token):
+def fetch_pull_request_counts(username, token):
+    """Count the user's pull requests in each of their repositories with the search API"""
+    pull_request_counts = {}
+    page = 1
+    while True:
+        results = github_api_request(
+            "/search/issues",
+            token,
+            params={"q": f"type:pr author:{username} user:{username}", "per_page": 100, "page": page}
+        )
+        if results.get("total_count", 0) > GITHUB_SEARCH_RESULT_LIMIT or results.get("incomplete_results"):
+            raise Exception(f"Search returned {results.get('total_count')} pull requests, too many to count reliably")
+        items = results.get("items", [])
+        for item in items:
+            repo_name = item["repository_url"].rsplit("/", 1)[-1]
+            pull_request_counts[repo_name] = pull_request_counts.get(repo_name, 0) + 1
+        if len(items) < 100:
+            break
+        page += 1
+    logger.debug(f"User {username} pull requests per repo: {pull_request_counts}")
+    return pull_request_counts
+
+def fetch_pull_request_count(username, repo_name, token, failures=None):
     pull_request_count = 0
     page = 1
     while True:
@@ -145,14 +306,15 @@ def fetch_pull_request_count(username, repo_name, token):
             if len(pulls) < 100:  # No more pull requests to fetch
                 break
             page += 1
-            time.sleep(0.1)
         except Exception as e:
             logger.error(f"Error fetching pull requests for repo {repo_name}: {e}")
+            if failures is not None:
+                failures.append(f"pull requests of {repo_name}: {e}")
             break
     logger.debug(f"User {username} made {pull_request_count} pull requests in repo {repo_name}")
     return pull_request_count
 
-def fetch_workflow_count(username, repo_name, token):
+def fetch_workflow_count(username, repo_name, token, failures=None):
     try:
         workflows = github_api_request(
             f"/repos/{username}/{repo_name}/actions/workflows",
@@ -162,45 +324,103 @@ def fetch_workflow_count(username, repo_name, token):
         return workflows.get("total_count", 0)
     except Exception as e:
         logger.error(f"Error fetching workflows for repo {repo_name}: {e}")
+        if failures is not None:
+            failures.append(f"workflows of {repo_name}: {e}")
         return 0
 
-def fetch_user_repositories(username, token):
+def fetch_user_repositories(username, token, failures=None):
+    """Return the user's repositories with their counts; fetches that fail count as 0 and are noted in `failures`"""
     logger.debug(f"Fetching repositories for username: {username}")
     repos_data = github_api_request(f"/users/{username}/repos", token, params={"per_page": 100})
-    repositories = []
-    for repo in repos_data:
-        commit_count = fetch_commit_count(username, repo["name"], token)
-        pull_request_count = fetch_pull_request_count(username, repo["name"], token)
-        workflow_count = fetch_workflow_count(username, repo["name"], token)
-        repositories.append({
-            "Name": repo["name"],
-            "Language": repo["language"],
-            "Languages URL": repo["languages_url"],
-            "commit_count": commit_count,
-            "pull_request_count": pull_request_count,
-            "workflow_count": workflow_count,
-            "fork": repo["fork"]
-        })
-        logger.debug(f"Repo {repo['name']}: {commit_count} commits, {pull_request_count} PRs, {workflow_count} workflows by {username}")
+
+    # One search covers the pull requests of every repository; paginate per repo only if it fails
+    pull_request_counts = None
+    if GITHUB_COUNT_STRATEGY == "fast":
+        try:
+            pull_request_counts = fetch_pull_request_counts(username, token)
+        except Exception as e:
+            logger.warning(f"Fast pull request count failed for {username}, paginating instead: {e}")
+
+    # The per-repo counts are independent, so fetch them all concurrently
+    with ThreadPoolExecutor(max_workers=GITHUB_MAX_CONCURRENCY) as executor:
+        count_futures = [
+            (
+                repo,
+                executor.submit(fetch_commit_count, username, repo["name"], token, failures),
+                executor.submit(fetch_pull_request_count, username, repo["name"], token, failures) if pull_request_counts is None else None,
+                executor.submit(fetch_workflow_count, username, repo["name"], token, failures),
+            )
+            for repo in repos_data
+        ]
+        repositories = []
+        for repo, commit_future, pull_request_future, workflow_future in count_futures:
+            commit_count = commit_future.result()
+            if pull_request_future is None:
+                pull_request_count = pull_request_counts.get(repo["name"], 0)
+            else:
+                pull_request_count = pull_request_future.result()
+            workflow_count = workflow_future.result()
+            repositories.append({
+                "Name": repo["name"],
+                "Language": repo["language"],
+                "Languages URL": repo["languages_url"],
+                "commit_count": commit_count,
+                "pull_request_count": pull_request_count,
+                "workflow_count": workflow_count,
+                "fork": repo["fork"]
+            })
+            logger.debug(f"Repo {repo['name']}: {commit_count} commits, {pull_request_count} PRs, {workflow_count} workflows by {username}")
     return repositories
+
 def fetch_repository_languages(languages_url, token):
     logger.debug(f"Fetching languages for URL: {languages_url}")
-    endpoint = languages_url.replace("https://api.github.com", "")
+    endpoint = languages_url.replace(GITHUB_API_URL, "")
     return github_api_request(endpoint, token)
 
-def analyze_languages(repositories, token):
+def fetch_repository_languages_safe(repo, token, failures=None):
+    try:
+        return fetch_repository_languages(repo["Languages URL"], token)
+    except Exception as e:
+        logger.error(f"Error fetching languages for repo {repo.get('Name')}: {e}")
+        if failures is not None:
+            failures.append(f"languages of {repo.get('Name')}: {e}")
+        return {}
+
+def analyze_languages(repositories, token, failures=None):
     languages_analysis = {}
-    for repo in repositories:
-        languages_url = repo.get("Languages URL")
-        if languages_url:
-            try:
-                languages_data = fetch_repository_languages(languages_url, token)
-                for language, bytes_written in languages_data.items():
-                    languages_analysis[language] = languages_analysis.get(language, 0) + bytes_written
-            except Exception as e:
-                logger.error(f"Error fetching languages for repo {repo.get('Name')}: {e}")
+    repos_with_languages = [repo for repo in repositories if repo.get("Languages URL")]
+    with ThreadPoolExecutor(max_workers=GITHUB_MAX_CONCURRENCY) as executor:
+        for languages_data in executor.map(lambda repo: fetch_repository_languages_safe(repo, token, failures), repos_with_languages):
+            for language, bytes_written in languages_data.items():
+                languages_analysis[language] = languages_analysis.get(language, 0) + bytes_written
     return languages_analysis
 
+def collect_github_profile(username, token):
+    """Return the user's repositories and language totals, reusing a recent crawl when there is one"""
+    cache = get_cache("github", GITHUB_CACHE_MAX_BYTES)
+    cache_key = f"profile:{username.lower()}"
+    # The disk cache treats ttl=0 as "never expires", so a disabled profile cache must skip it entirely
+    profile = cache.get(cache_key) if GITHUB_PROFILE_CACHE_TTL > 0 else None
+    if profile is not None:
+        logger.debug(f"Using cached GitHub profile for {username}")
+        return profile["repositories"], profile["languages_analysis"]
+
+    failures = []
+    repositories = fetch_user_repositories(username, token, failures)
+    languages_analysis = analyze_languages(repositories, token, failures)
+    # A crawl with failed fetches (e.g. the rate limit running out) undercounts; using it is fine, keeping it is not
+    if failures:
+        logger.warning(f"Not caching GitHub profile for {username}: {len(failures)} fetches failed, first: {failures[0]}")
+        return repositories, languages_analysis
+    if GITHUB_PROFILE_CACHE_TTL <= 0:
+        return repositories, languages_analysis
+    cache.set(
+        cache_key,
+        {"repositories": repositories, "languages_analysis": languages_analysis},
+        ttl=GITHUB_PROFILE_CACHE_TTL
+    )
+    return repositories, languages_analysis
+
 def extract_github_id(resume_text):
     logger.debug(f"Extracting GitHub ID from resume text: {resume_text[:100]}...")
     github_patterns = [
@@ -276,7 +496,7 @@ class PDFReport(FPDF):
         self.set_font("helvetica", "B", 16)
         self.set_text_color(50, 50, 50)
         self.cell(0, 10, "Developer Report", border=0, ln=1, align="C")
-        self.image("https://cdn-icons-png.flaticon.com/512/3891/3891670.png", x=10, y=10, w=30)
+        report_assets.image(self, "logo.png", x=10, y=10, w=30)
         self.ln(15)
 
     def footer(self):
@@ -292,6 +512,165 @@ def section_header(pdf, title):
     pdf.cell(0, 10, title, ln=1, fill=True, align="C")
     pdf.ln(3)
 
+def render_report(resume_file_path, min_salary, max_salary, progress):
+    """Build the developer report PDF in memory; returns (pdf_bytes, github_id) and raises JobError on failure"""
+    if not resume_file_path.startswith(RESUME_URL_PREFIX):
+        logger.error(f"Resume file path is not a valid Cloudinary URL: {resume_file_path}")
+        raise JobError("Invalid resume file path", 400)
+
+    # Fetch resume using public URL
+    progress(5, "fetching resume")
+    logger.debug(f"Fetching resume from: {resume_file_path}")
+    resume_response = http_get(resume_file_path, timeout=10)
+    if resume_response.status_code != 200:
+        logger.error(f"Failed to fetch resume from {resume_file_path}: Status {resume_response.status_code}")
+        raise JobError("Failed to fetch resume", 400, f"Status {resume_response.status_code}")
+
+    progress(10, "extracting resume text")
+    resume_text = extract_pdf_text_and_links(BytesIO(resume_response.content))
+    if not resume_text:
+        logger.error("Failed to extract text from resume")
+        raise JobError("Failed to extract text from resume", 400)
+
+    github_id = extract_github_id(resume_text)
+    if not github_id:
+        logger.error("No GitHub ID found in resume")
+        raise JobError("No GitHub ID found in resume", 400)
+
+    progress(15, "collecting GitHub data")
+    token = get_github_token()
+    repositories, languages_analysis = collect_github_profile(github_id, token)
+    summary_stats = {
+        "total_repositories": len(repositories),
+        "total_commits": sum(repo.get("commit_count", 0) for repo in repositories),
+        "total_pull_requests": sum(repo.get("pull_request_count", 0) for repo in repositories),
+        "total_workflows": sum(repo.get("workflow_count", 0) for repo in repositories)
+    }
+    logger.debug(f"Summary stats for {github_id}: {summary_stats}")
+    all_repos_skills = {repo["Language"]: sum(1 for r in repositories if r["Language"] == repo["Language"]) for repo in repositories if repo["Language"]}
+    user_owned_repos = [repo for repo in repositories if not repo.get("fork", False)]
+    user_owned_repos_skills = {repo["Language"]: sum(1 for r in user_owned_repos if r["Language"] == repo["Language"]) for repo in user_owned_repos if repo["Language"]}
+    user_owned_repos_languages = {k: v for k, v in languages_analysis.items() if any(k == repo["Language"] for repo in user_owned_repos)}
+
+    github_rating = compute_github_rating({"summary_statistics": summary_stats})
+    offered_salary = map_rating_to_salary(github_rating, min_salary, max_salary)
+    overall_rating = github_rating
+
+    progress(75, "rendering report")
+    pdf = PDFReport()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=20)
+
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=1, align="C")
+    pdf.ln(5)
+
+    section_header(pdf, "GitHub Summary Statistics")
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 8, f"Total Repositories: {summary_stats['total_repositories']}", ln=1)
+    pdf.cell(0, 8, f"Total Commits: {summary_stats['total_commits']}", ln=1)
+    pdf.cell(0, 8, f"Total Pull Requests: {summary_stats['total_pull_requests']}", ln=1)
+    pdf.cell(0, 8, f"Total Workflows: {summary_stats['total_workflows']}", ln=1)
+    pdf.ln(5)
+
+    section_header(pdf, "Skills Analysis (All Repositories)")
+    pdf.set_text_color(0, 0, 0)
+    for skill, count in all_repos_skills.items():
+        pdf.cell(0, 8, f"{skill}: {count} repositories", ln=1)
+    pdf.ln(5)
+
+    section_header(pdf, "Languages Used (All Repositories)")
+    pdf.set_text_color(0, 0, 0)
+    if languages_analysis:
+        pdf.set_font("helvetica", "B", 12)
+        pdf.cell(0, 8, "Language Distribution:", ln=1)
+        pdf.ln(5)
+        max_bytes = max(languages_analysis.values())
+        current_y = pdf.get_y()
+        for lang, bytes_written in sorted(languages_analysis.items(), key=lambda x: x[1], reverse=True):
+            current_y = draw_language_bar(pdf, lang, bytes_written, max_bytes, current_y)
+    else:
+        pdf.cell(0, 8, "No data available.", ln=1)
+    pdf.ln(5)
+
+    pdf.add_page()
+    section_header(pdf, "Skills Analysis (User-Owned Repositories)")
+    pdf.set_text_color(0, 0, 0)
+    for skill, count in user_owned_repos_skills.items():
+        pdf.cell(0, 8, f"{skill}: {count} repositories", ln=1)
+    pdf.ln(5)
+
+    section_header(pdf, "Languages Used (User-Owned Repositories)")
+    pdf.set_text_color(0, 0, 0)
+    if user_owned_repos_languages:
+        pdf.set_font("helvetica", "B", 12)
+        pdf.cell(0, 8, "Language Distribution:", ln=1)
+        pdf.ln(5)
+        max_bytes = max(user_owned_repos_languages.values())
+        current_y = pdf.get_y()
+        for lang, bytes_written in sorted(user_owned_repos_languages.items(), key=lambda x: x[1], reverse=True):
+            current_y = draw_language_bar(pdf, lang, bytes_written, max_bytes, current_y)
+    else:
+        pdf.cell(0, 8, "No data available.", ln=1)
+    pdf.ln(5)
+
+    section_header(pdf, "Candidate Evaluation")
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 8, f"GitHub Rating: {github_rating:.2f}/10", ln=1)
+    pdf.cell(0, 8, f"Suggested Salary: {offered_salary:.2f} LPA", ln=1)
+    pdf.cell(0, 8, f"Overall Rating: {overall_rating:.2f}/10", ln=1)
+
+    # FPDF 1.7 returns the document as a latin-1 string
+    pdf_bytes = pdf.output(dest='S').encode('latin-1')
+    logger.debug(f"Rendered PDF in memory, size: {len(pdf_bytes)} bytes")
+    if not pdf_bytes:
+        logger.error("Generated PDF is empty")
+        raise JobError("Failed to generate PDF: empty file", 500)
+    return pdf_bytes, github_id
+
+def upload_report(pdf_bytes, github_id, progress):
+    """Upload a rendered report to Cloudinary straight from memory and return its URL"""
+    progress(85, "uploading report")
+    report_filename = f"report_{github_id}_{uuid.uuid4().hex[:8]}"
+    try:
+        result = upload(
+            BytesIO(pdf_bytes),
+            folder='reports',
+            public_id=report_filename,
+            resource_type='raw',
+            access_mode='public'
+        )
+        report_url = result['secure_url']
+        logger.debug(f"PDF uploaded to Cloudinary: {report_url}, size: {result.get('bytes', 'unknown')} bytes")
+    except Exception as e:
+        logger.error(f"Cloudinary upload failed: {str(e)}")
+        raise JobError("Failed to upload PDF to Cloudinary", 500, str(e))
+
+    # Verify the uploaded PDF without downloading it again
+    progress(95, "verifying upload")
+    if REPORT_VERIFY_MODE == "metadata":
+        if result.get('bytes') != len(pdf_bytes):
+            logger.error(f"Uploaded PDF size mismatch: {report_url}, uploaded {result.get('bytes')} of {len(pdf_bytes)} bytes")
+            raise JobError("Uploaded PDF is not accessible or invalid", 500, f"Uploaded {result.get('bytes')} of {len(pdf_bytes)} bytes")
+    elif REPORT_VERIFY_MODE == "head":
+        try:
+            pdf_response = http_head(report_url, timeout=10)
+        except Exception as e:
+            logger.error(f"Failed to verify uploaded PDF: {str(e)}")
+            raise JobError("Failed to verify uploaded PDF", 500, str(e))
+        if pdf_response.status_code != 200 or pdf_response.headers.get('Content-Type') != 'application/pdf':
+            logger.error(f"Uploaded PDF is not accessible or invalid: {report_url}, Status: {pdf_response.status_code}, Content-Type: {pdf_response.headers.get('Content-Type')}")
+            raise JobError("Uploaded PDF is not accessible or invalid", 500, f"Status {pdf_response.status_code}")
+    return report_url
+
+def build_report(resume_file_path, min_salary, max_salary, progress=None):
+    """Generate the developer report for a resume and upload it; raises JobError on failure"""
+    progress = progress or (lambda percent, stage: None)
+    pdf_bytes, github_id = render_report(resume_file_path, min_salary, max_salary, progress)
+    report_url = upload_report(pdf_bytes, github_id, progress)
+    return {"filePath": report_url, "githubId": github_id}
+
 @report_bp.route('/generate-report', methods=['POST'])
 def generate_report():
     logger.debug(f"Received request for /report/generate-report: {request.method} {request.headers.get('Origin')}")
@@ -300,6 +679,11 @@ def generate_report():
     resume_file_path = data.get('resumeFilePath')
     min_salary = data.get('min_salary')
     max_salary = data.get('max_salary')
+    # In async mode the report is built by the job queue and polled via /report/status/<id>
+    run_async = data.get('async', False)
+    callback_url = data.get('callbackUrl')
+    # "inline" returns the PDF itself instead of uploading it to Cloudinary
+    delivery = data.get('delivery', 'cloudinary')
 
     if not resume_file_path:
         logger.error("resumeFilePath is missing in request")
@@ -313,163 +697,180 @@ def generate_report():
         logger.error("min_salary must be less than max_salary")
         return jsonify({"error": "min_salary must be less than max_salary"}), 400
 
-    try:
-        if not resume_file_path.startswith('https://res.cloudinary.com'):
-            logger.error(f"Resume file path is not a valid Cloudinary URL: {resume_file_path}")
-            return jsonify({"error": "Invalid resume file path"}), 400
-
-        # Fetch resume using public URL
-        logger.debug(f"Fetching resume from: {resume_file_path}")
-        resume_response = requests.get(resume_file_path, timeout=10)
-        if resume_response.status_code != 200:
-            logger.error(f"Failed to fetch resume from {resume_file_path}: Status {resume_response.status_code}")
-            return jsonify({"error": "Failed to fetch resume", "details": f"Status {resume_response.status_code}"}), 400
-
-        resume_text = extract_pdf_text_and_links(BytesIO(resume_response.content))
-        if not resume_text:
-            logger.error("Failed to extract text from resume")
-            return jsonify({"error": "Failed to extract text from resume"}), 400
-
-        github_id = extract_github_id(resume_text)
-        if not github_id:
-            logger.error("No GitHub ID found in resume")
-            return jsonify({"error": "No GitHub ID found in resume"}), 400
-
-        token = get_github_token()
-        repositories = fetch_user_repositories(github_id, token)
-        languages_analysis = analyze_languages(repositories, token)
-        summary_stats = {
-            "total_repositories": len(repositories),
-            "total_commits": sum(repo.get("commit_count", 0) for repo in repositories),
-            "total_pull_requests": sum(repo.get("pull_request_count", 0) for repo in repositories),
-            "total_workflows": sum(repo.get("workflow_count", 0) for repo in repositories)
-        }
-        logger.debug(f"Summary stats for {github_id}: {summary_stats}")
-        all_repos_skills = {repo["Language"]: sum(1 for r in repositories if r["Language"] == repo["Language"]) for repo in repositories if repo["Language"]}
-        user_owned_repos = [repo for repo in repositories if not repo.get("fork", False)]
-        user_owned_repos_skills = {repo["Language"]: sum(1 for r in user_owned_repos if r["Language"] == repo["Language"]) for repo in user_owned_repos if repo["Language"]}
-        user_owned_repos_languages = {k: v for k, v in languages_analysis.items() if any(k == repo["Language"] for repo in user_owned_repos)}
-
-        github_rating = compute_github_rating({"summary_statistics": summary_stats})
-        offered_salary = map_rating_to_salary(github_rating, min_salary, max_salary)
-        overall_rating = github_rating
-
-        pdf = PDFReport()
-        pdf.add_page()
-        pdf.set_auto_page_break(auto=True, margin=20)
-
-        pdf.set_font("helvetica", "", 12)
-        pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=1, align="C")
-        pdf.ln(5)
-
-        section_header(pdf, "GitHub Summary Statistics")
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(0, 8, f"Total Repositories: {summary_stats['total_repositories']}", ln=1)
-        pdf.cell(0, 8, f"Total Commits: {summary_stats['total_commits']}", ln=1)
-        pdf.cell(0, 8, f"Total Pull Requests: {summary_stats['total_pull_requests']}", ln=1)
-        pdf.cell(0, 8, f"Total Workflows: {summary_stats['total_workflows']}", ln=1)
-        pdf.ln(5)
-
-        section_header(pdf, "Skills Analysis (All Repositories)")
-        pdf.set_text_color(0, 0, 0)
-        for skill, count in all_repos_skills.items():
-            pdf.cell(0, 8, f"{skill}: {count} repositories", ln=1)
-        pdf.ln(5)
-
-        section_header(pdf, "Languages Used (All Repositories)")
-        pdf.set_text_color(0, 0, 0)
-        if languages_analysis:
-            pdf.set_font("helvetica", "B", 12)
-            pdf.cell(0, 8, "Language Distribution:", ln=1)
-            pdf.ln(5)
-            max_bytes = max(languages_analysis.values())
-            current_y = pdf.get_y()
-            for lang, bytes_written in sorted(languages_analysis.items(), key=lambda x: x[1], reverse=True):
-                current_y = draw_language_bar(pdf, lang, bytes_written, max_bytes, current_y)
-        else:
-            pdf.cell(0, 8, "No data available.", ln=1)
-        pdf.ln(5)
+    if delivery not in ('cloudinary', 'inline'):
+        logger.error(f"Invalid delivery: {delivery}")
+        return jsonify({"error": "delivery must be 'cloudinary' or 'inline'"}), 400
 
-        pdf.add_page()
-        section_header(pdf, "Skills Analysis (User-Owned Repositories)")
-        pdf.set_text_color(0, 0, 0)
-        for skill, count in user_owned_repos_skills.items():
-            pdf.cell(0, 8, f"{skill}: {count} repositories", ln=1)
-        pdf.ln(5)
+    if run_async and delivery == 'inline':
+        logger.error("Inline delivery requested for an async report")
+        return jsonify({"error": "Inline delivery is not available for async reports"}), 400
 
-        section_header(pdf, "Languages Used (User-Owned Repositories)")
-        pdf.set_text_color(0, 0, 0)
-        if user_owned_repos_languages:
-            pdf.set_font("helvetica", "B", 12)
-            pdf.cell(0, 8, "Language Distribution:", ln=1)
-            pdf.ln(5)
-            max_bytes = max(user_owned_repos_languages.values())
-            current_y = pdf.get_y()
-            for lang, bytes_written in sorted(user_owned_repos_languages.items(), key=lambda x: x[1], reverse=True):
-                current_y = draw_language_bar(pdf, lang, bytes_written, max_bytes, current_y)
-        else:
-            pdf.cell(0, 8, "No data available.", ln=1)
-        pdf.ln(5)
+    # Job records are posted only to hosts the deployment trusts, never to an arbitrary client-supplied address
+    if callback_url and not is_allowed_callback(callback_url):
+        logger.error(f"Callback URL is not allowed: {callback_url}")
+        return jsonify({"error": "callbackUrl is not an allowed callback host"}), 400
 
-        section_header(pdf, "Candidate Evaluation")
-        pdf.set_text_color(0, 0, 0)
-        pdf.set_font("helvetica", "", 12)
-        pdf.cell(0, 8, f"GitHub Rating: {github_rating:.2f}/10", ln=1)
-        pdf.cell(0, 8, f"Suggested Salary: {offered_salary:.2f} LPA", ln=1)
-        pdf.cell(0, 8, f"Overall Rating: {overall_rating:.2f}/10", ln=1)
-
-        # Save PDF to a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            pdf.output(temp_file.name)
-            temp_file_path = temp_file.name
-            temp_file_size = os.path.getsize(temp_file_path)
-            logger.debug(f"Temporary PDF created at {temp_file_path}, size: {temp_file_size} bytes")
-
-        # Verify the temporary PDF is not empty
-        if temp_file_size == 0:
-            logger.error("Generated PDF is empty")
-            os.unlink(temp_file_path)
-            return jsonify({"error": "Failed to generate PDF: empty file"}), 500
-
-        # Upload the temporary file to Cloudinary
-        report_filename = f"report_{github_id}_{uuid.uuid4().hex[:8]}"
+    if run_async:
         try:
-            result = upload(
-                temp_file_path,
-                folder='reports',
-                public_id=report_filename,
-                resource_type='raw',
-                access_mode='public'
+            job_id = get_job_queue().submit(
+                "report", build_report, resume_file_path, min_salary, max_salary, callback_url=callback_url
             )
-            report_url = result['secure_url']
-            logger.debug(f"PDF uploaded to Cloudinary: {report_url}, size: {result.get('bytes', 'unknown')} bytes")
         except Exception as e:
-            logger.error(f"Cloudinary upload failed: {str(e)}")
-            os.unlink(temp_file_path)
-            return jsonify({"error": "Failed to upload PDF to Cloudinary", "details": str(e)}), 500
-
-        # Clean up the temporary file
-        os.unlink(temp_file_path)
+            logger.error(f"Failed to queue report generation: {str(e)}")
+            return jsonify({"error": "Failed to queue report generation", "details": str(e)}), 500
+        return jsonify({"jobId": job_id, "statusUrl": f"/report/status/{job_id}"}), 202
 
-        # Verify the uploaded PDF is accessible
-        try:
-            pdf_response = requests.get(report_url, timeout=10)
-            if pdf_response.status_code != 200 or pdf_response.headers.get('Content-Type') != 'application/pdf':
-                logger.error(f"Uploaded PDF is not accessible or invalid: {report_url}, Status: {pdf_response.status_code}, Content-Type: {pdf_response.headers.get('Content-Type')}")
-                return jsonify({"error": "Uploaded PDF is not accessible or invalid", "details": f"Status {pdf_response.status_code}"}), 500
-        except Exception as e:
-            logger.error(f"Failed to verify uploaded PDF: {str(e)}")
-            return jsonify({"error": "Failed to verify uploaded PDF", "details": str(e)}), 500
+    try:
+        if delivery == 'inline':
+            pdf_bytes, github_id = render_report(resume_file_path, min_salary, max_salary, lambda percent, stage: None)
+            return send_file(
+                BytesIO(pdf_bytes),
+                mimetype='application/pdf',
+                as_attachment=True,
+                download_name=f"report_{github_id}.pdf"
+            )
 
+        report = build_report(resume_file_path, min_salary, max_salary)
+        report_url = report["filePath"]
         response = jsonify({"filePath": report_url})
         response.headers['X-Report-FilePath'] = report_url
-        response.headers['Content-Disposition'] = f'attachment; filename="report_{github_id}.pdf"'
+        response.headers['Content-Disposition'] = f'attachment; filename="report_{report["githubId"]}.pdf"'
         logger.debug(f"Set X-Report-FilePath header: {report_url}")
         return response
+    except JobError as e:
+        return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         logger.error(f"Error in generate_report: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+def job_status(job_id, kind, label):
+    """Answer a status poll for a queued job of the given kind; a completed job's result fields are included"""
+    job = get_job_queue().get(job_id)
+    if not job or job["kind"] != kind:
+        return jsonify({"error": f"{label} job not found"}), 404
+
+    status = {
+        "jobId": job["id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "stage": job["stage"],
+    }
+    if job["status"] == "completed":
+        status.update(job["result"])
+    elif job["status"] == "failed":
+        status.update(job["error"])
+    return jsonify(status)
+
+@report_bp.route('/status/<job_id>', methods=['GET'])
+def report_status(job_id):
+    return job_status(job_id, "report", "Report")
+
+def store_resume(file_content, public_id, progress=None):
+    """Upload a resume to Cloudinary, make sure it is public and reachable, and return its URL; raises JobError on failure"""
+    progress = progress or (lambda percent, stage: None)
+    progress(10, "uploading resume")
+    try:
+        result = upload(
+            file_content,
+            folder='resumes',
+            public_id=public_id,
+            resource_type='raw',
+            access_mode='public',
+            upload_preset='flask_public_upload'
+        )
+    except Exception as e:
+        logger.error(f"Cloudinary upload failed: {str(e)}")
+        if "Upload preset not found" in str(e):
+            raise JobError(
+                "Cloudinary configuration error", 500,
+                "Upload preset 'flask_public_upload' not found. Please create it in Cloudinary."
+            )
+        raise JobError("Failed to upload resume to Cloudinary", 500, str(e))
+    file_url = result['secure_url']
+    uploaded_public_id = result.get('public_id')
+    access_mode = result.get('access_mode', 'unknown')
+    logger.debug(f"Resume uploaded to Cloudinary: {file_url}, public_id: {uploaded_public_id}, access_mode: {access_mode}")
+
+    if access_mode != 'public':
+        logger.warning(f"Uploaded file {uploaded_public_id} has access_mode: {access_mode}. Updating to public.")
+        progress(60, "updating access mode")
+        try:
+            api.update(
+                uploaded_public_id,
+                resource_type='raw',
+                access_mode='public'
+            )
+            logger.debug(f"Updated {uploaded_public_id} to access_mode: public")
+        except Exception as e:
+            logger.error(f"Failed to update access_mode for {uploaded_public_id}: {str(e)}")
+            raise JobError("Failed to set public access for resume", 500, str(e))
+
+    # Verify file accessibility
+    progress(80, "verifying upload")
+    try:
+        verify_response = http_get(file_url, timeout=10)
+    except Exception as e:
+        logger.error(f"Failed to verify uploaded resume {file_url}: {str(e)}")
+        raise JobError("Failed to upload resume to Cloudinary", 500, str(e))
+    if verify_response.status_code != 200:
+        logger.error(f"Uploaded file is not publicly accessible: {file_url}, Status: {verify_response.status_code}")
+        raise JobError("Uploaded file is not publicly accessible", 500, f"Status {verify_response.status_code}")
+    return file_url
+
+def analyze_resume_content(file_content, job_role, output_mode=LLM_OUTPUT_MODE):
+    """Extract the text of an uploaded resume and analyze it; raises JobError if no text can be extracted"""
+    resume_text = analyzer.extract_text_from_pdf(BytesIO(file_content))
+    if not resume_text:
+        logger.error("Failed to extract text from PDF")
+        raise JobError("Failed to extract text from PDF", 400)
+    analysis_result = analyzer.analyze_resume_with_gemini(resume_text, job_role=job_role if job_role else None, output_mode=output_mode)
+    logger.debug(f"Resume analysis result: {analysis_result}")
+    return resume_text, analysis_result
+
+def index_uploaded_resume(file_url, resume_text, progress=None):
+    # Embed the resume once so job matching can rank it without re-reading the PDF
+    try:
+        index_resume(file_url, resume_text)
+    except Exception as e:
+        logger.error(f"Failed to index resume {file_url}: {str(e)}")
+
+def queue_resume_indexing(file_url, resume_text):
+    # Embedding (and, the first time in a worker, loading the model) is slow, so it never holds up the response
+    try:
+        get_job_queue().submit("resume_index", index_uploaded_resume, file_url, resume_text)
+    except Exception as e:
+        logger.error(f"Failed to queue indexing of resume {file_url}: {str(e)}")
+
+class PendingResumeIndex:
+    """Queues indexing of a deferred upload once it is both stored and analyzed, whichever happens last"""
+
+    def __init__(self, file_url):
+        self.file_url = file_url
+        self._resume_text = None
+        self._stored = False
+        self._lock = threading.Lock()
+
+    def stored(self):
+        with self._lock:
+            self._stored = True
+            ready = self._resume_text is not None
+        if ready:
+            queue_resume_indexing(self.file_url, self._resume_text)
+
+    def analyzed(self, resume_text):
+        with self._lock:
+            self._resume_text = resume_text
+            ready = self._stored
+        if ready:
+            queue_resume_indexing(self.file_url, resume_text)
+
+def finish_resume_storage(file_content, public_id, pending_index, progress):
+    """Background half of a deferred upload: store the resume and let it be indexed under the URL the client was given"""
+    stored_url = store_resume(file_content, public_id, progress)
+    pending_index.stored()
+    # filePath stays the URL the client was given, which the resume is also indexed under
+    return {"filePath": pending_index.file_url, "storedFilePath": stored_url}
+
 @app.route('/upload_resume', methods=['POST'])
 def upload_resume():
     if 'resume' not in request.files:
@@ -488,70 +889,291 @@ def upload_resume():
 
     job_category = request.args.get('job_category')
     job_role = request.args.get('job_role')
-    logger.debug(f"Uploading resume: {file.filename}, job_category: {job_category}, job_role: {job_role}")
+    # Return the analysis as soon as it is ready and upload the resume afterwards, polled via /upload_resume/status/<id>
+    defer_storage = request.args.get('defer_storage', '').lower() in ('1', 'true', 'yes')
+    # Send the analysis as server-sent events while Gemini writes it instead of in one response at the end
+    stream = request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+    # "json" returns the analysis sections as typed fields under "structured" as well as markdown; streaming is markdown only
+    output_mode = request.args.get('output_mode', LLM_OUTPUT_MODE)
+    if output_mode not in LLM_OUTPUT_MODES:
+        logger.error(f"Invalid output_mode: {output_mode}")
+        return jsonify({"error": f"output_mode must be one of: {', '.join(LLM_OUTPUT_MODES)}"}), 400
+    logger.debug(f"Uploading resume: {file.filename}, job_category: {job_category}, job_role: {job_role}, defer_storage: {defer_storage}, stream: {stream}")
+
+    file_content = file.read()
+    public_id = f"resume_{uuid.uuid4().hex[:8]}"
+
+    if stream:
+        return stream_upload_resume(file_content, public_id, job_role, defer_storage)
 
     try:
-        file_content = file.read()
-        result = upload(
-            file_content,
-            folder='resumes',
-            public_id=f"resume_{uuid.uuid4().hex[:8]}",
-            resource_type='raw',
-            access_mode='public',
-            upload_preset='flask_public_upload'
-        )
-        file_url = result['secure_url']
-        public_id = result.get('public_id')
-        access_mode = result.get('access_mode', 'unknown')
-        logger.debug(f"Resume uploaded to Cloudinary: {file_url}, public_id: {public_id}, access_mode: {access_mode}")
-
-        if access_mode != 'public':
-            logger.warning(f"Uploaded file {public_id} has access_mode: {access_mode}. Updating to public.")
-            try:
-                api.update(
-                    public_id,
-                    resource_type='raw',
-                    access_mode='public'
-                )
-                logger.debug(f"Updated {public_id} to access_mode: public")
-            except Exception as e:
-                logger.error(f"Failed to update access_mode for {public_id}: {str(e)}")
-                return jsonify({"error": "Failed to set public access for resume", "details": str(e)}), 500
-
-        # Verify file accessibility
-        verify_response = requests.get(file_url, timeout=10)
-        if verify_response.status_code != 200:
-            logger.error(f"Uploaded file is not publicly accessible: {file_url}, Status: {verify_response.status_code}")
-            return jsonify({"error": "Uploaded file is not publicly accessible", "details": f"Status {verify_response.status_code}"}), 500
+        if defer_storage:
+            # Queued first, so the upload runs alongside the analysis rather than after it
+            file_url, storage, pending_index = defer_resume_storage(file_content, public_id)
+            resume_text, analysis_result = analyze_resume_content(file_content, job_role, output_mode)
+            pending_index.analyzed(resume_text)
+            return jsonify({"filePath": file_url, **storage, **analysis_result})
+
+        # Storage (upload, access fix-up, verification) and analysis (extraction, Gemini) only share the
+        # uploaded bytes, so they run side by side and the request takes as long as the slower of the two
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upload-resume")
+        storage_future = executor.submit(store_resume, file_content, public_id)
+        analysis_future = executor.submit(analyze_resume_content, file_content, job_role, output_mode)
+        executor.shutdown(wait=False)
+
+        # Storage errors take precedence, as they did when the upload came first
+        file_url = storage_future.result()
+        resume_text, analysis_result = analysis_future.result()
+        queue_resume_indexing(file_url, resume_text)
+        return jsonify({"filePath": file_url, **analysis_result})
+    except JobError as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        logger.error(f"Resume upload failed: {str(e)}")
+        return jsonify({"error": "Failed to upload resume to Cloudinary", "details": str(e)}), 500
 
-        resume_text = analyzer.extract_text_from_pdf(BytesIO(file_content))
+def predict_resume_url(public_id):
+    # Cloudinary delivery paths follow from the public id, so the client gets a working URL before the upload is
+    # done; it is served from RESUME_URL_PREFIX so it passes the same checks as the URL Cloudinary reports
+    delivery_url = cloudinary_url(f"resumes/{public_id}", resource_type='raw', secure=True)[0]
+    return f"{RESUME_URL_PREFIX.rstrip('/')}{urlparse(delivery_url).path}"
+
+def defer_resume_storage(file_content, public_id):
+    """Queue the upload of a resume and return (predicted URL, storage job fields for the response, PendingResumeIndex)"""
+    file_url = predict_resume_url(public_id)
+    pending_index = PendingResumeIndex(file_url)
+    # Uploads take seconds and the client is waiting to use the URL, so they never queue behind minute-long reports
+    job_id = get_job_queue().submit(
+        "resume_storage", finish_resume_storage, file_content, public_id, pending_index, pool="storage"
+    )
+    return file_url, {"storageJobId": job_id, "storageStatusUrl": f"/upload_resume/status/{job_id}"}, pending_index
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_upload_resume(file_content, public_id, job_role, defer_storage):
+    """Answer /upload_resume?stream=true with server-sent events.
+
+    Events: "storage" (deferred uploads only, sent first), "extracting" as soon as the request is accepted, "chunk"
+    for each piece of the analysis, "score" when the ATS or resume score is final, "stored" with the resume's URL,
+    then "result" or "error".
+    """
+    storage_future = None
+    pending_index = None
+    deferred_url = None
+    if defer_storage:
+        try:
+            deferred_url, storage, pending_index = defer_resume_storage(file_content, public_id)
+        except Exception as e:
+            logger.error(f"Failed to queue resume storage: {str(e)}")
+            return jsonify({"error": "Failed to queue resume storage", "details": str(e)}), 500
+    else:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-resume")
+        storage_future = executor.submit(store_resume, file_content, public_id)
+        executor.shutdown(wait=False)
+
+    def generate():
+        file_url = deferred_url
+        if pending_index is not None:
+            yield sse_event("storage", {"filePath": file_url, **storage})
+        # Scanned resumes go through OCR, which can take far longer than the first byte should
+        yield sse_event("extracting", {})
+        try:
+            resume_text = analyzer.extract_text_from_pdf(BytesIO(file_content))
+        except Exception as e:
+            logger.error(f"Failed to extract text from PDF: {str(e)}")
+            resume_text = None
         if not resume_text:
             logger.error("Failed to extract text from PDF")
-            return jsonify({"error": "Failed to extract text from PDF"}), 400
-
-        analysis_result = analyzer.analyze_resume_with_gemini(resume_text, job_role=job_role if job_role else None)
-        logger.debug(f"Resume analysis result: {analysis_result}")
-
-        return jsonify({"filePath": file_url, **analysis_result})
+            yield sse_event("error", {"error": "Failed to extract text from PDF"})
+            return
+        if pending_index is not None:
+            pending_index.analyzed(resume_text)
+
+        analysis_result = None
+        for event in analyzer.stream_resume_analysis(resume_text, job_role=job_role if job_role else None):
+            name = event.pop("event")
+            if name == "result":
+                analysis_result = event
+            else:
+                yield sse_event(name, event)
+
+        if storage_future is not None:
+            try:
+                file_url = storage_future.result()
+            except JobError as e:
+                yield sse_event("error", e.to_dict())
+                return
+            except Exception as e:
+                logger.error(f"Resume upload failed: {str(e)}")
+                yield sse_event("error", {"error": "Failed to upload resume to Cloudinary", "details": str(e)})
+                return
+            queue_resume_indexing(file_url, resume_text)
+            yield sse_event("stored", {"filePath": file_url})
+
+        if analysis_result is not None:
+            yield sse_event("result", {"filePath": file_url, **analysis_result})
+
+    # Proxies must pass events through as they are written
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/upload_resume/status/<job_id>', methods=['GET'])
+def upload_resume_status(job_id):
+    return job_status(job_id, "resume_storage", "Resume storage")
+
+def encode_job_cursor(search_query, page, size):
+    payload = json.dumps({"q": search_query, "page": page, "size": size}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+def decode_job_cursor(cursor):
+    if not isinstance(cursor, str):
+        raise TypeError(f"cursor must be a string, got {type(cursor).__name__}")
+    payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    return payload["q"], int(payload["page"]), int(payload["size"])
+
+def load_resume_for_ranking(resume_file_path, method):
+    """Return (resume_text, resume_vector) for ranking jobs, reusing the indexed embedding when there is one"""
+    if method == "embedding":
+        resume_vector = get_resume_index().get_vector(resume_file_path)
+        if resume_vector is not None:
+            return None, resume_vector
+    resume_text = fetch_resume_text_for_matching(resume_file_path)
+    if method != "embedding":
+        return resume_text, None
+    resume_vector = get_embedding_scorer().embed_text(resume_text)
+    try:
+        get_resume_index().add(resume_file_path, resume_vector)
     except Exception as e:
-        logger.error(f"Cloudinary upload failed: {str(e)}")
-        if "Upload preset not found" in str(e):
-            return jsonify({
-                "error": "Cloudinary configuration error",
-                "details": "Upload preset 'flask_public_upload' not found. Please create it in Cloudinary."
-            }), 500
-        return jsonify({"error": "Failed to upload resume to Cloudinary", "details": str(e)}), 500
+        logger.error(f"Failed to index resume {resume_file_path}: {str(e)}")
+    return resume_text, resume_vector
 
 @app.route('/recommend-jobs', methods=['POST'])
 def recommend_jobs():
     data = request.get_json()
     search_query = data.get("search_query", "")
+    cursor = data.get("cursor")
+    # With a resume, jobs come back sorted by how well they fit it instead of in Adzuna's order
+    resume_file_path = data.get("resumeFilePath") or data.get("resumeId")
+    ranking_method = data.get("rankingMethod", JOB_RANKING_METHOD)
+    paginated = any(key in data for key in ("page", "size", "cursor", "prefetch", "stream"))
+    try:
+        if cursor:
+            search_query, page, size = decode_job_cursor(cursor)
+        else:
+            page = int(data.get("page", 1))
+            size = int(data.get("size", RESULTS_PER_PAGE))
+        prefetch = int(data.get("prefetch", 0))
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Invalid pagination parameters: {e}")
+        return jsonify({"error": "Invalid page, size, prefetch or cursor"}), 400
     if not search_query:
         logger.error("Search query is required")
         return jsonify({"error": "Search query is required"}), 400
-    jobs = get_job_listings(search_query)
-    logger.debug(f"Job listings: {jobs}")
-    return jsonify(jobs)
+    if resume_file_path and not resume_file_path.startswith(RESUME_URL_PREFIX):
+        logger.error(f"Resume file path is not a valid Cloudinary URL: {resume_file_path}")
+        return jsonify({"error": "Invalid resume file path"}), 400
+    if ranking_method not in RANKING_METHODS:
+        logger.error(f"Invalid rankingMethod: {ranking_method}")
+        return jsonify({"error": f"rankingMethod must be one of: {', '.join(RANKING_METHODS)}"}), 400
+
+    # The resume is fetched (or its embedding looked up) while Adzuna is being queried
+    resume_future = None
+    if resume_file_path:
+        resume_executor = ThreadPoolExecutor(max_workers=1)
+        resume_future = resume_executor.submit(load_resume_for_ranking, resume_file_path, ranking_method)
+        resume_executor.shutdown(wait=False)
+
+    def rank(jobs):
+        if resume_future is None:
+            return jobs
+        resume_text, resume_vector = resume_future.result()
+        return rank_jobs(jobs, ranking_method, resume_text=resume_text, resume_vector=resume_vector)
+
+    def resume_error(e):
+        logger.error(f"Failed to load resume {resume_file_path} for ranking: {str(e)}")
+        return jsonify({"error": "Failed to load resume for ranking", "details": str(e)}), 400
+
+    def search_unavailable(e):
+        # An outage must not look like a search without results; the retry is already queued in the background
+        logger.error(f"Job search unavailable for {search_query!r}: {str(e)}")
+        response = jsonify({"error": "Job search is temporarily unavailable", "unavailable": True})
+        response.headers["Retry-After"] = str(e.retry_after or 1)
+        return response, 503
+
+    # Without any pagination parameters the response stays the plain first-page list
+    if not paginated:
+        try:
+            jobs = get_job_listings(search_query)
+        except JobSearchUnavailable as e:
+            return search_unavailable(e)
+        try:
+            jobs = rank(jobs)
+        except Exception as e:
+            return resume_error(e)
+        logger.debug(f"Job listings: {jobs}")
+        return jsonify(jobs)
+
+    if page < 1 or not 1 <= size <= MAX_RESULTS_PER_PAGE or not 0 <= prefetch <= JOB_SEARCH_MAX_PREFETCH:
+        logger.error(f"Invalid pagination parameters: page={page}, size={size}, prefetch={prefetch}")
+        return jsonify({
+            "error": f"page must be at least 1, size between 1 and {MAX_RESULTS_PER_PAGE}, prefetch between 0 and {JOB_SEARCH_MAX_PREFETCH}"
+        }), 400
+
+    if not data.get("stream"):
+        try:
+            result = get_job_page(search_query, page, size)
+        except JobSearchUnavailable as e:
+            return search_unavailable(e)
+        # Later pages are fetched in the background so following requests are answered from the cache
+        if prefetch and len(result["jobs"]) == size:
+            prefetch_job_pages(search_query, page, size, prefetch)
+        try:
+            jobs = rank(result["jobs"])
+        except Exception as e:
+            return resume_error(e)
+        return jsonify({
+            "jobs": jobs,
+            "page": page,
+            "size": size,
+            "total": result["count"],
+            "nextCursor": encode_job_cursor(search_query, page + 1, size) if len(result["jobs"]) == size else None,
+        })
+
+    # Fail before streaming starts if the resume cannot be loaded
+    if resume_future is not None:
+        try:
+            resume_future.result()
+        except Exception as e:
+            return resume_error(e)
+
+    # The first page decides the status code, so an outage is a 503 rather than an empty stream
+    pages = iter_job_pages(search_query, page, size, prefetch)
+    try:
+        first_page = next(pages)
+    except JobSearchUnavailable as e:
+        return search_unavailable(e)
+
+    def generate():
+        # One line per page as soon as it arrives, then the cursor for whatever follows; pages are ranked individually
+        number, result = first_page
+        try:
+            while True:
+                yield json.dumps({"page": number, "jobs": rank(result["jobs"]), "total": result["count"]}) + "\n"
+                next_cursor = encode_job_cursor(search_query, number + 1, size) if len(result["jobs"]) == size else None
+                try:
+                    number, result = next(pages)
+                except StopIteration:
+                    break
+                except JobSearchUnavailable:
+                    # The cursor points at the page that failed, so the client can retry from there
+                    yield json.dumps({"page": number + 1, "error": "Job search is temporarily unavailable", "unavailable": True}) + "\n"
+                    break
+            yield json.dumps({"nextCursor": next_cursor}) + "\n"
+        finally:
+            # Stops the page fetches still running if the client goes away
+            pages.close()
+
+    return Response(generate(), mimetype='application/x-ndjson')
 
 @app.route('/match_resume_job', methods=['POST'])
 def match_resume_job():
@@ -560,6 +1182,8 @@ def match_resume_job():
     resume_file_path = data.get('resumeFilePath')
     job_description = data.get('jobDescription')
     job_role = data.get('jobRole')
+    scoring_mode = data.get('scoringMode', 'llm')
+    output_mode = data.get('outputMode', LLM_OUTPUT_MODE)
 
     if not resume_file_path:
         logger.error("resumeFilePath is missing in request")
@@ -567,60 +1191,211 @@ def match_resume_job():
     if not job_description:
         logger.error("jobDescription is missing in request")
         return jsonify({"error": "jobDescription is required"}), 400
+    if scoring_mode not in SCORING_MODES:
+        logger.error(f"Invalid scoringMode: {scoring_mode}")
+        return jsonify({"error": f"scoringMode must be one of: {', '.join(SCORING_MODES)}"}), 400
+    if output_mode not in LLM_OUTPUT_MODES:
+        logger.error(f"Invalid outputMode: {output_mode}")
+        return jsonify({"error": f"outputMode must be one of: {', '.join(LLM_OUTPUT_MODES)}"}), 400
 
     try:
         # Fetch resume from Cloudinary
         logger.debug(f"Fetching resume from: {resume_file_path}")
-        resume_response = requests.get(resume_file_path, timeout=10)
+        resume_response = http_get(resume_file_path, timeout=10)
         if resume_response.status_code != 200:
             logger.error(f"Failed to fetch resume from {resume_file_path}: Status {resume_response.status_code}")
             return jsonify({"error": "Failed to fetch resume", "details": f"Status {resume_response.status_code}"}), 400
 
-        # Save PDF content to a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            temp_file.write(resume_response.content)
-            temp_file_path = temp_file.name
-            logger.debug(f"Temporary PDF saved at {temp_file_path}, size: {os.path.getsize(temp_file_path)} bytes")
+        # The PDF is parsed straight from memory, so no temporary file is needed
+        match_result = matcher.match_resume_to_job(BytesIO(resume_response.content), job_description, job_role, scoring_mode=scoring_mode, output_mode=output_mode)
 
-        try:
-            # Try matching with the temporary file path
-            match_result = matcher.match_resume_to_job(temp_file_path, job_description, job_role)
+        if "error" in match_result:
+            logger.error(f"Matching failed: {match_result['error']}")
+            return jsonify({"error": match_result['error']}), 400
 
-            if "error" in match_result:
-                logger.error(f"Matching failed: {match_result['error']}")
-                return jsonify({"error": match_result['error']}), 400
+        logger.debug(f"Match result: {match_result}")
+        return jsonify(match_result)
 
-            logger.debug(f"Match result: {match_result}")
-            return jsonify(match_result)
+    except Exception as e:
+        logger.error(f"Error in match_resume_job: {str(e)}")
+        return jsonify({"error": str(e)}), 500
 
-        except Exception as e:
-            logger.warning(f"Matching with file path failed: {str(e)}. Falling back to BytesIO method.")
-            # Fallback to original BytesIO method
-            match_result = matcher.match_resume_to_job(BytesIO(resume_response.content), job_description, job_role)
-
-            if "error" in match_result:
-                logger.error(f"Matching failed: {match_result['error']}")
-                # Try extracting text with existing method as a last resort
-                resume_text = extract_pdf_text_and_links(BytesIO(resume_response.content))
-                if not resume_text:
-                    logger.error("Fallback text extraction failed")
-                    return jsonify({"error": "Failed to extract text from resume using fallback method"}), 400
-                # If text is extracted, you may need to modify ResumeJobMatcher to accept text directly
-                return jsonify({"error": "Text extracted but matching not implemented for raw text", "extracted_text": resume_text[:500]})
-
-            logger.debug(f"Fallback match result: {match_result}")
-            return jsonify(match_result)
+def fetch_resume_text_for_matching(resume_file_path):
+    logger.debug(f"Fetching resume from: {resume_file_path}")
+    resume_response = http_get(resume_file_path, timeout=10)
+    if resume_response.status_code != 200:
+        raise Exception(f"Failed to fetch resume: Status {resume_response.status_code}")
 
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                logger.debug(f"Cleaned up temporary file: {temp_file_path}")
+    resume_text = matcher.extract_text_from_pdf(BytesIO(resume_response.content))
+    if not resume_text:
+        raise Exception("Failed to extract text from resume")
+    return resume_text
 
+def match_resume_for_batch(resume_file_path, job_description, job_role, job_prompt):
+    try:
+        resume_text = fetch_resume_text_for_matching(resume_file_path)
+        match_result = matcher.match_text_to_job(resume_text, job_description, job_role, job_prompt=job_prompt)
     except Exception as e:
-        logger.error(f"Error in match_resume_job: {str(e)}")
+        match_result = {"error": str(e)}
+    return {"resumeFilePath": resume_file_path, **match_result}
+
+@app.route('/match_resume_job/batch', methods=['POST'])
+def match_resume_job_batch():
+    data = request.get_json()
+    resume_file_paths = data.get('resumeFilePaths')
+    job_description = data.get('jobDescription')
+    job_role = data.get('jobRole')
+    # "hybrid" scores every resume locally and only re-ranks the top-k with Gemini
+    scoring_mode = data.get('scoringMode', 'llm')
+    try:
+        rerank_top_k = int(data.get('rerankTopK', MATCH_RERANK_TOP_K))
+        if rerank_top_k < 0:
+            raise ValueError(f"rerankTopK must not be negative, got {rerank_top_k}")
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid rerankTopK: {e}")
+        return jsonify({"error": "rerankTopK must be a non-negative integer"}), 400
+
+    if not isinstance(resume_file_paths, list) or not resume_file_paths:
+        logger.error("resumeFilePaths is missing in request")
+        return jsonify({"error": "resumeFilePaths must be a non-empty list"}), 400
+    if len(resume_file_paths) > MATCH_BATCH_MAX_RESUMES:
+        logger.error(f"Batch too large: {len(resume_file_paths)} resumes")
+        return jsonify({"error": f"At most {MATCH_BATCH_MAX_RESUMES} resumes can be matched per batch"}), 400
+    for path in resume_file_paths:
+        if path and not (isinstance(path, str) and path.startswith(RESUME_URL_PREFIX)):
+            logger.error(f"Resume file path is not a valid Cloudinary URL: {path}")
+            return jsonify({"error": "Invalid resume file path"}), 400
+    if not job_description:
+        logger.error("jobDescription is missing in request")
+        return jsonify({"error": "jobDescription is required"}), 400
+    if scoring_mode not in SCORING_MODES + ("hybrid",):
+        logger.error(f"Invalid scoringMode: {scoring_mode}")
+        return jsonify({"error": f"scoringMode must be one of: {', '.join(SCORING_MODES + ('hybrid',))}"}), 400
+
+    # The same resume may be shared by several entries; score each URL once
+    unique_paths = list(dict.fromkeys(path for path in resume_file_paths if path))
+    job_prompt = matcher.build_job_prompt(job_description, job_role)
+    logger.debug(f"Batch matching {len(unique_paths)} resumes against job role: {job_role} ({scoring_mode})")
+
+    def generate_llm_scores(executor):
+        futures = [
+            executor.submit(match_resume_for_batch, path, job_description, job_role, job_prompt)
+            for path in unique_paths
+        ]
+        for future in as_completed(futures):
+            yield json.dumps(future.result()) + "\n"
+
+    def generate_embedding_scores(executor):
+        resume_texts = {}
+        futures = {executor.submit(fetch_resume_text_for_matching, path): path for path in unique_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                resume_texts[path] = future.result()
+            except Exception as e:
+                yield json.dumps({"resumeFilePath": path, "error": str(e)}) + "\n"
+        if not resume_texts:
+            return
+
+        paths = list(resume_texts)
+        results = matcher.score_texts_with_embeddings([resume_texts[path] for path in paths], job_description, job_role)
+        ranked = sorted(zip(paths, results), key=lambda item: item[1].get("match_score", -1), reverse=True)
+        for path, result in ranked:
+            yield json.dumps({"resumeFilePath": path, **result}) + "\n"
+
+        if scoring_mode == "hybrid":
+            top_paths = [path for path, result in ranked[:rerank_top_k] if "error" not in result]
+            rerank_futures = {
+                executor.submit(matcher.match_text_to_job, resume_texts[path], job_description, job_role, job_prompt): path
+                for path in top_paths
+            }
+            for future in as_completed(rerank_futures):
+                yield json.dumps({"resumeFilePath": rerank_futures[future], "stage": "rerank", **future.result()}) + "\n"
+
+    def generate():
+        with ThreadPoolExecutor(max_workers=MATCH_BATCH_WORKERS) as executor:
+            if scoring_mode == "llm":
+                yield from generate_llm_scores(executor)
+            else:
+                yield from generate_embedding_scores(executor)
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@app.route('/resume_index/query', methods=['POST'])
+def query_resume_index():
+    data = request.get_json()
+    job_description = data.get('jobDescription')
+    job_role = data.get('jobRole')
+    resume_file_paths = data.get('resumeFilePaths')
+    index_missing = data.get('indexMissing', False)
+
+    if not job_description:
+        logger.error("jobDescription is missing in request")
+        return jsonify({"error": "jobDescription is required"}), 400
+    if resume_file_paths is not None and not isinstance(resume_file_paths, list):
+        logger.error("resumeFilePaths must be a list")
+        return jsonify({"error": "resumeFilePaths must be a list"}), 400
+    for path in resume_file_paths or []:
+        if path and not (isinstance(path, str) and path.startswith(RESUME_URL_PREFIX)):
+            logger.error(f"Resume file path is not a valid Cloudinary URL: {path}")
+            return jsonify({"error": "Invalid resume file path"}), 400
+    if resume_file_paths is not None:
+        resume_file_paths = list(dict.fromkeys(path for path in resume_file_paths if path))
+    try:
+        top_k = int(data.get('topK', len(resume_file_paths) if resume_file_paths is not None else 10))
+        if top_k < 0:
+            raise ValueError(f"topK must not be negative, got {top_k}")
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid topK: {e}")
+        return jsonify({"error": "topK must be a non-negative integer"}), 400
+
+    try:
+        resume_index = get_resume_index()
+        missing = []
+        if resume_file_paths is not None:
+            missing = resume_index.missing(resume_file_paths)
+            if missing and index_missing:
+                missing = backfill_resume_index(missing)
+
+        scorer = get_embedding_scorer()
+        job_vector = scorer.embed_text(f"{job_role}\n{job_description}" if job_role else job_description)
+        results = resume_index.query(job_vector, top_k=top_k, resume_ids=resume_file_paths)
+        scores = scorer.similarity_to_score([similarity for _, similarity in results])
+        matches = [
+            {"resumeFilePath": path, "match_score": int(score), "similarity": round(similarity, 4)}
+            for (path, similarity), score in zip(results, scores)
+        ]
+        logger.debug(f"Resume index query returned {len(matches)} matches, {len(missing)} resumes not indexed")
+        return jsonify({"matches": matches, "missing": missing})
+    except Exception as e:
+        logger.error(f"Error in query_resume_index: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+def backfill_resume_index(resume_file_paths):
+    """Fetch, extract and index resumes uploaded before the index existed; returns the ones that failed"""
+    failed = []
+    resume_texts = {}
+    with ThreadPoolExecutor(max_workers=MATCH_BATCH_WORKERS) as executor:
+        futures = {executor.submit(fetch_resume_text_for_matching, path): path for path in resume_file_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                resume_texts[path] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to index resume {path}: {str(e)}")
+                failed.append(path)
+    if resume_texts:
+        paths = list(resume_texts)
+        vectors = get_embedding_scorer().embed_texts([resume_texts[path] for path in paths])
+        resume_index = get_resume_index()
+        for path, vector in zip(paths, vectors):
+            resume_index.add(path, vector)
+    return failed
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({"llm": get_llm_cache_stats(), "job_search": get_job_search_cache_stats()})
+
 app.register_blueprint(report_bp)
 
 if __name__ == '__main__':
@@ -0,0 +1,367 @@
+"""Benchmark the PDF extractors over a locally generated corpus of synthetic resumes.
+
+Usage:
+    python benchmarks/extraction_benchmark.py --output results.json
+    python benchmarks/extraction_benchmark.py --output new.json --baseline results.json
+
+Every extractor runs in its own subprocess so its peak RSS is measured in isolation.
+"""
+import os
+import sys
+import json
+import time
+import random
+import resource
+import argparse
+import platform
+import subprocess
+import tempfile
+from collections import Counter
+from io import BytesIO
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+KINDS = ("text", "multipage", "links", "image")
+EXTRACTORS = ("unified", "pdfplumber", "PyPDF2", "tesseract")
+
+FIRST_NAMES = ["Alex", "Priya", "Jordan", "Wei", "Maria", "Samuel", "Aisha", "Kenji", "Olivia", "Rahul"]
+LAST_NAMES = ["Kumar", "Garcia", "Smith", "Chen", "Okafor", "Nguyen", "Rossi", "Sharma", "Brown", "Tanaka"]
+SKILLS = [
+    "Python", "Flask", "React", "Node.js", "PostgreSQL", "Docker", "Kubernetes", "AWS", "TensorFlow",
+    "Pandas", "GraphQL", "TypeScript", "Redis", "Terraform", "Java", "Spring", "Go", "Rust", "Kafka", "Airflow",
+]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli"]
+VERBS = ["Built", "Designed", "Led", "Optimized", "Migrated", "Automated", "Scaled", "Shipped"]
+OBJECTS = [
+    "a recommendation service handling 2M requests per day",
+    "the CI pipeline reducing build times by 40 percent",
+    "a data platform for real time analytics",
+    "the payments API used by 300 merchants",
+    "an internal design system adopted by 12 teams",
+    "a search index over 50M documents",
+]
+
+
+def _resume_sections(rng, kind):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    sections = [("", [name, f"{name.split()[0].lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}"])]
+    sections.append(("Skills", [", ".join(rng.sample(SKILLS, 8))]))
+    jobs = rng.randint(8, 12) if kind == "multipage" else rng.randint(2, 3)
+    for _ in range(jobs):
+        bullets = [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(rng.randint(3, 5))]
+        sections.append((f"{rng.choice(COMPANIES)} - Software Engineer ({rng.randint(2012, 2024)})", bullets))
+    sections.append(("Education", ["B.Tech in Computer Science, State University"]))
+    return sections
+
+
+def _section_lines(sections):
+    lines = []
+    for title, body in sections:
+        lines.extend(([title] if title else []) + body)
+    return lines
+
+
+def _render_text_pdf(sections, links):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    for title, lines in sections:
+        if title:
+            pdf.set_font("Arial", "B", 12)
+            pdf.multi_cell(0, 7, title)
+        pdf.set_font("Arial", size=10)
+        for line in lines:
+            pdf.multi_cell(0, 6, line)
+        pdf.ln(2)
+    for label, url in links:
+        pdf.set_text_color(0, 0, 255)
+        pdf.cell(0, 6, label, ln=1, link=url)
+    return pdf.output(dest="S").encode("latin-1"), pdf.page_no()
+
+
+def _render_image_pdf(sections):
+    from fpdf import FPDF
+    from PIL import Image, ImageDraw
+
+    # Draw the resume onto a bitmap so the PDF has no text layer, like a scanned upload
+    lines = _section_lines(sections)
+    image = Image.new("L", (1700, 2200), 255)
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines):
+        draw.text((100, 100 + index * 40), line, fill=0)
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as image_file:
+        image.save(image_file, format="PNG")
+        image_path = image_file.name
+    try:
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.image(image_path, x=0, y=0, w=210)
+        return pdf.output(dest="S").encode("latin-1"), 1
+    finally:
+        os.unlink(image_path)
+
+
+def build_corpus(corpus_dir, per_kind, seed):
+    """Write per_kind synthetic resumes of every kind to corpus_dir and return their manifest"""
+    rng = random.Random(seed)
+    os.makedirs(corpus_dir, exist_ok=True)
+    manifest = []
+    for kind in KINDS:
+        for index in range(per_kind):
+            sections = _resume_sections(rng, kind)
+            links = []
+            if kind == "links":
+                handle = f"user{rng.randint(1000, 9999)}"
+                links = [
+                    ("GitHub", f"https://github.com/{handle}"),
+                    ("LinkedIn", f"https://www.linkedin.com/in/{handle}"),
+                    ("Portfolio", f"https://{handle}.dev"),
+                ] + [(f"Project {n}", f"https://github.com/{handle}/project-{n}") for n in range(rng.randint(5, 10))]
+            if kind == "image":
+                pdf_bytes, pages = _render_image_pdf(sections)
+            else:
+                pdf_bytes, pages = _render_text_pdf(sections, links)
+            path = os.path.join(corpus_dir, f"{kind}-{index:03d}.pdf")
+            with open(path, "wb") as pdf_file:
+                pdf_file.write(pdf_bytes)
+            manifest.append({
+                "path": path,
+                "kind": kind,
+                "pages": pages,
+                "text": "\n".join(_section_lines(sections) + [label for label, _ in links]),
+                "links": [url for _, url in links],
+            })
+    return manifest
+
+
+def _extract_unified(pdf_bytes):
+    from pdf_extraction import extract_pdf
+
+    result = extract_pdf(pdf_bytes, use_cache=False)
+    return result["text"], result["links"]
+
+
+def _extract_pdfplumber(pdf_bytes):
+    import pdfplumber
+
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        texts = [page.extract_text() or "" for page in pdf.pages]
+        links = [link["uri"] for page in pdf.pages for link in page.hyperlinks if link.get("uri")]
+    return "\n".join(texts), links
+
+
+def _extract_pypdf2(pdf_bytes):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+    return "\n".join(page.extract_text() or "" for page in reader.pages), []
+
+
+def _extract_tesseract(pdf_bytes):
+    from ocr_engine import ocr_pdf
+
+    texts, complete = ocr_pdf(pdf_bytes)
+    # ocr_pdf logs and blanks pages it could not read (e.g. without tesseract installed), which is not a result
+    if not complete:
+        raise RuntimeError(f"OCR read {sum(1 for text in texts if text)} of {len(texts)} pages")
+    return "\n".join(texts), []
+
+
+EXTRACTOR_FUNCTIONS = {
+    "unified": _extract_unified,
+    "pdfplumber": _extract_pdfplumber,
+    "PyPDF2": _extract_pypdf2,
+    "tesseract": _extract_tesseract,
+}
+
+
+def _words(text):
+    return Counter(word.strip(".,;:()|").lower() for word in text.split() if word.strip(".,;:()|"))
+
+
+def text_fidelity(expected, actual):
+    """Word-level F1 between the generated text and the extracted text"""
+    expected_words, actual_words = _words(expected), _words(actual)
+    overlap = sum((expected_words & actual_words).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(actual_words.values())
+    recall = overlap / sum(expected_words.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def link_fidelity(expected, actual):
+    if not expected:
+        return None
+    return len(set(expected) & set(actual)) / len(set(expected))
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 4) if values else None
+
+
+def run_worker(extractor, manifest_path, iterations):
+    """Benchmark one extractor over the corpus inside this process and return its summary"""
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+    extract = EXTRACTOR_FUNCTIONS[extractor]
+    latencies = []
+    by_kind = {}
+    failures = 0
+    total_pages = 0
+    total_seconds = 0.0
+    for document in manifest:
+        with open(document["path"], "rb") as pdf_file:
+            pdf_bytes = pdf_file.read()
+        extracted = None
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                text, links = extract(pdf_bytes)
+            except Exception as e:
+                # Failed runs are counted but kept out of the timings and fidelity, which would otherwise look real
+                failures += 1
+                print(f"{extractor} failed on {document['path']}: {e}", file=sys.stderr)
+                continue
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            total_seconds += elapsed
+            total_pages += document["pages"]
+            extracted = text, links
+        if extracted is not None:
+            scores = by_kind.setdefault(document["kind"], {"text": [], "links": []})
+            scores["text"].append(text_fidelity(document["text"], extracted[0]))
+            scores["links"].append(link_fidelity(document["links"], extracted[1]))
+
+    return {
+        "documents": len(manifest),
+        "iterations": iterations,
+        "failures": failures,
+        "pages_per_second": round(total_pages / total_seconds, 2) if total_seconds else None,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2) if latencies else None,
+            "p95": round(_percentile(latencies, 95) * 1000, 2) if latencies else None,
+        },
+        # ru_maxrss is reported in KiB on Linux and bytes on macOS
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1
+        ),
+        "fidelity": {
+            "text": _mean([score for scores in by_kind.values() for score in scores["text"]]),
+            "links": _mean([score for scores in by_kind.values() for score in scores["links"]]),
+        },
+        "fidelity_by_kind": {
+            kind: {"text": _mean(scores["text"]), "links": _mean(scores["links"])} for kind, scores in by_kind.items()
+        },
+    }
+
+
+def run_extractor(extractor, manifest_path, iterations):
+    """Run one extractor in a fresh subprocess so its memory use is not mixed with the others"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", extractor, "--manifest", manifest_path,
+         "--iterations", str(iterations)],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "worker failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, max_slowdown, max_fidelity_drop):
+    """Return a list of regressions of results against a previous run"""
+    regressions = []
+    for extractor, current in results["extractors"].items():
+        previous = baseline.get("extractors", {}).get(extractor)
+        if not previous or "error" in previous or "error" in current:
+            continue
+        if current["failures"] > previous["failures"]:
+            regressions.append(f"{extractor}: failures up from {previous['failures']} to {current['failures']}")
+        if previous["latency_ms"]["p95"] and current["latency_ms"]["p95"]:
+            slowdown = current["latency_ms"]["p95"] / previous["latency_ms"]["p95"] - 1
+            if slowdown > max_slowdown:
+                regressions.append(f"{extractor}: p95 latency up {slowdown:.0%}")
+        for metric in ("text", "links"):
+            before, after = previous["fidelity"][metric], current["fidelity"][metric]
+            if before is not None and after is not None and before - after > max_fidelity_drop:
+                regressions.append(f"{extractor}: {metric} fidelity down from {before} to {after}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="extraction_benchmark.json")
+    parser.add_argument("--corpus-dir", help="Keep the generated corpus here instead of a temporary directory")
+    parser.add_argument("--per-kind", type=int, default=5, help="Resumes generated per kind")
+    parser.add_argument("--iterations", type=int, default=3, help="Extractions timed per resume")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--extractors", default=",".join(EXTRACTORS))
+    parser.add_argument("--baseline", help="Previous results to compare against; exits non-zero on regressions")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="Allowed relative p95 latency increase")
+    parser.add_argument("--max-fidelity-drop", type=float, default=0.02)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--manifest", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.manifest, args.iterations)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = args.corpus_dir or os.path.join(temp_dir, "corpus")
+        manifest = build_corpus(corpus_dir, args.per_kind, args.seed)
+        manifest_path = os.path.join(temp_dir, "manifest.json")
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        results = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": {"seed": args.seed, "per_kind": args.per_kind, "kinds": list(KINDS),
+                       "pages": sum(document["pages"] for document in manifest)},
+            "extractors": {},
+        }
+        for extractor in args.extractors.split(","):
+            print(f"Benchmarking {extractor}...", file=sys.stderr)
+            results["extractors"][extractor] = run_extractor(extractor, manifest_path, args.iterations)
+
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    for extractor, summary in results["extractors"].items():
+        if "error" in summary:
+            print(f"{extractor:<12} error: {summary['error']}")
+            continue
+        # Values are None when every run failed
+        print(
+            f"{extractor:<12} {str(summary['pages_per_second']):>9} pages/s  p50 {str(summary['latency_ms']['p50']):>8} ms  "
+            f"p95 {str(summary['latency_ms']['p95']):>8} ms  rss {summary['peak_rss_mb']:>7} MB  "
+            f"text {summary['fidelity']['text']}  links {summary['fidelity']['links']}  failures {summary['failures']}"
+        )
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.max_slowdown, args.max_fidelity_drop)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
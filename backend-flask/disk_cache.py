@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import struct
+import logging
+import threading
+import lmdb
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+# Per-entry bookkeeping stored next to each value: last access time, value size and expiry (0 = never)
+_LRU_RECORD = struct.Struct("<dQd")
+_TOTAL_BYTES_KEY = b"total_bytes"
+
+
+class DiskCache:
+    """Size-bounded LRU cache of JSON values with optional TTLs in a local LMDB environment shared by all workers"""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._env = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        # LMDB handles must not cross a fork, so every worker process opens its own
+        with self._lock:
+            if self._env is None or self._pid != os.getpid():
+                os.makedirs(self.path, exist_ok=True)
+                self._env = lmdb.open(
+                    self.path,
+                    map_size=self.max_bytes * 2 + 16 * 1024 * 1024,
+                    max_dbs=3,
+                    max_readers=512,
+                )
+                self._entries = self._env.open_db(b"entries")
+                self._lru = self._env.open_db(b"lru")
+                self._meta = self._env.open_db(b"meta")
+                self._pid = os.getpid()
+            return self._env
+
+    def get(self, key):
+        try:
+            env = self._open()
+            key_bytes = key.encode("utf-8")
+            with env.begin(write=True) as txn:
+                value = txn.get(key_bytes, db=self._entries)
+                if value is None:
+                    return None
+                _, size, expires_at = _LRU_RECORD.unpack(txn.get(key_bytes, db=self._lru))
+                now = time.time()
+                if expires_at and expires_at <= now:
+                    txn.delete(key_bytes, db=self._entries)
+                    txn.delete(key_bytes, db=self._lru)
+                    txn.put(_TOTAL_BYTES_KEY, str(self._total_bytes(txn) - size).encode("utf-8"), db=self._meta)
+                    return None
+                txn.put(key_bytes, _LRU_RECORD.pack(now, size, expires_at), db=self._lru)
+            return json.loads(value)
+        except Exception as e:
+            logger.error(f"Cache read failed for {self.path}: {e}")
+            return None
+
+    def set(self, key, value, ttl=None):
+        try:
+            env = self._open()
+            key_bytes = key.encode("utf-8")
+            value_bytes = json.dumps(value).encode("utf-8")
+            size = len(key_bytes) + len(value_bytes)
+            if size > self.max_bytes:
+                logger.warning(f"Not caching {key}: {size} bytes exceeds cache capacity")
+                return
+            with env.begin(write=True) as txn:
+                total = self._total_bytes(txn)
+                previous = txn.get(key_bytes, db=self._lru)
+                if previous is not None:
+                    total -= _LRU_RECORD.unpack(previous)[1]
+                txn.put(key_bytes, value_bytes, db=self._entries)
+                now = time.time()
+                txn.put(key_bytes, _LRU_RECORD.pack(now, size, now + ttl if ttl else 0), db=self._lru)
+                total += size
+                if total > self.max_bytes:
+                    total = self._evict(txn, total)
+                txn.put(_TOTAL_BYTES_KEY, str(total).encode("utf-8"), db=self._meta)
+        except Exception as e:
+            logger.error(f"Cache write failed for {self.path}: {e}")
+
+    def incr(self, counter, amount=1):
+        """Increment a named counter kept alongside the entries; counters are never evicted"""
+        try:
+            env = self._open()
+            key_bytes = f"counter:{counter}".encode("utf-8")
+            with env.begin(write=True) as txn:
+                value = int(txn.get(key_bytes, default=b"0", db=self._meta)) + amount
+                txn.put(key_bytes, str(value).encode("utf-8"), db=self._meta)
+        except Exception as e:
+            logger.error(f"Cache counter update failed for {self.path}: {e}")
+
+    def counters(self):
+        try:
+            env = self._open()
+            with env.begin(db=self._meta) as txn:
+                return {
+                    key.decode("utf-8")[len("counter:"):]: int(value)
+                    for key, value in txn.cursor()
+                    if key.startswith(b"counter:")
+                }
+        except Exception as e:
+            logger.error(f"Cache counter read failed for {self.path}: {e}")
+            return {}
+
+    def _total_bytes(self, txn):
+        total = txn.get(_TOTAL_BYTES_KEY, db=self._meta)
+        return int(total) if total else 0
+
+    def _evict(self, txn, total):
+        # Evict least recently used entries until the cache is back under 90% of capacity
+        target = int(self.max_bytes * 0.9)
+        records = sorted(
+            (_LRU_RECORD.unpack(record) + (key,) for key, record in txn.cursor(db=self._lru)),
+        )
+        evicted = 0
+        for _, size, _, key in records:
+            if total <= target:
+                break
+            txn.delete(key, db=self._entries)
+            txn.delete(key, db=self._lru)
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} entries from {self.path}, {total} bytes in use")
+        return total
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, max_bytes):
+    """Return the process-wide cache stored under CACHE_DIR/<name>"""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = DiskCache(os.path.join(CACHE_DIR, name), max_bytes)
+        return _caches[name]
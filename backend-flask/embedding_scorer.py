@@ -0,0 +1,89 @@
+import os
+import logging
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = os.environ.get("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", 32))
+
+# Cosine similarities between a resume and a job description rarely leave this band,
+# so it is stretched linearly onto the 0-100 scale used by the Gemini match score
+EMBEDDING_SCORE_FLOOR = float(os.environ.get("EMBEDDING_SCORE_FLOOR", 0.15))
+EMBEDDING_SCORE_CEILING = float(os.environ.get("EMBEDDING_SCORE_CEILING", 0.75))
+
+# The model only reads its first few hundred tokens, so long texts are embedded in word windows
+CHUNK_WORDS = 200
+
+
+class EmbeddingScorer:
+    """CPU-only resume/job similarity scoring with a local sentence-transformers model"""
+
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                logger.debug(f"Loading embedding model {self.model_name}")
+                self._model = SentenceTransformer(self.model_name, device="cpu")
+            return self._model
+
+    def _chunk_text(self, text):
+        words = text.split()
+        if not words:
+            return [""]
+        return [" ".join(words[i:i + CHUNK_WORDS]) for i in range(0, len(words), CHUNK_WORDS)]
+
+    def embed_texts(self, texts):
+        """Embed texts as unit-length float32 rows, averaging the chunks of long texts"""
+        chunks = []
+        owners = []
+        for index, text in enumerate(texts):
+            for chunk in self._chunk_text(text or ""):
+                chunks.append(chunk)
+                owners.append(index)
+
+        chunk_vectors = self._get_model().encode(
+            chunks,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32)
+
+        vectors = np.zeros((len(texts), chunk_vectors.shape[1]), dtype=np.float32)
+        np.add.at(vectors, np.asarray(owners), chunk_vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def embed_text(self, text):
+        return self.embed_texts([text])[0]
+
+    def similarity_to_score(self, similarities):
+        """Map cosine similarities onto the 0-100 match score scale"""
+        scaled = (np.asarray(similarities) - EMBEDDING_SCORE_FLOOR) / (EMBEDDING_SCORE_CEILING - EMBEDDING_SCORE_FLOOR)
+        return np.rint(np.clip(scaled, 0.0, 1.0) * 100).astype(int)
+
+    def score_texts(self, resume_texts, job_text):
+        """Return (similarities, scores) for each resume text against one job text"""
+        job_vector = self.embed_text(job_text)
+        similarities = self.embed_texts(resume_texts) @ job_vector
+        return similarities, self.similarity_to_score(similarities)
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_embedding_scorer():
+    """Return the process-wide scorer so the model is loaded once per worker"""
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = EmbeddingScorer()
+        return _scorer
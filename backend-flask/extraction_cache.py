@@ -0,0 +1,34 @@
+import os
+import hashlib
+import logging
+from disk_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get("EXTRACTION_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def content_hash(pdf_bytes):
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def _cache_key(pdf_bytes, namespace):
+    return f"{namespace}:{content_hash(pdf_bytes)}"
+
+
+def get_cached_extraction(pdf_bytes, namespace):
+    """Return the cached {"text", "links", "pages", "extractor"} record for a PDF, or None"""
+    cached = get_cache("extraction", EXTRACTION_CACHE_MAX_BYTES).get(_cache_key(pdf_bytes, namespace))
+    if cached is not None:
+        logger.debug(f"Extraction cache hit ({namespace}, extractor: {cached.get('extractor')})")
+    return cached
+
+
+def store_extraction(pdf_bytes, namespace, text, links=None, extractor=None, pages=None):
+    """Cache the result of a successful extraction under the PDF's content hash"""
+    if not text and not links:
+        return
+    get_cache("extraction", EXTRACTION_CACHE_MAX_BYTES).set(
+        _cache_key(pdf_bytes, namespace),
+        {"text": text, "links": links or [], "pages": pages or [], "extractor": extractor},
+    )
@@ -1,13 +1,29 @@
+import os
 import multiprocessing
 
 # Bind to port from environment variable
 bind = "0.0.0.0:5001"
 
-# Number of workers (2 * CPU cores + 1)
-workers = multiprocessing.cpu_count() * 2 + 1
+# Worker class. Almost every request waits on Cloudinary, GitHub, Adzuna or Gemini, so a worker should
+# keep many requests in flight instead of one:
+#   "gthread" (default) - `threads` requests per worker on a thread pool
+#   "gevent"            - `worker_connections` greenlets per worker; needs `pip install gevent`
+#   "sync"              - one request per worker
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
 
-# Worker class
-worker_class = "sync"
+# Requests handled concurrently by each gthread worker; gunicorn turns "sync" into gthread if this is above 1
+threads = int(os.environ.get("GUNICORN_THREADS", 32)) if worker_class == "gthread" else 1
+
+# Number of workers. Each one loads its own embedding model and OCR pool, so when a worker already serves many
+# requests at once one per core is enough; a one-request-per-worker setup keeps 2 * CPU cores + 1
+if threads > 1 or worker_class == "gevent":
+    default_workers = multiprocessing.cpu_count()
+else:
+    default_workers = multiprocessing.cpu_count() * 2 + 1
+workers = int(os.environ.get("GUNICORN_WORKERS", default_workers))
+
+# Requests handled concurrently by each gevent worker
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 500))
 
 # Timeout for workers
 timeout = 120
@@ -19,4 +35,12 @@ loglevel = "info"
 accesslog = "-"
 
 # Error log file
-errorlog = "-"
\ No newline at end of file
+errorlog = "-"
+
+
+def post_worker_init(worker):
+    # Gemini's gRPC transport blocks the whole gevent hub unless it is switched to cooperative polling
+    if worker_class == "gevent":
+        from grpc.experimental import gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+        worker.log.info("Initialized gRPC for gevent")
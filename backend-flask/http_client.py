@@ -0,0 +1,76 @@
+import os
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Number of distinct hosts kept in the pool and keep-alive connections kept per host; the latter
+# matches gunicorn's default thread count so concurrent requests do not churn connections
+HTTP_POOL_HOSTS = int(os.environ.get("HTTP_POOL_HOSTS", 10))
+HTTP_POOL_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_POOL_CONNECTIONS_PER_HOST", 32))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 30))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", 3))
+HTTP_BACKOFF_FACTOR = float(os.environ.get("HTTP_BACKOFF_FACTOR", 0.5))
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions = {}
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _build_session(retries):
+    retry = Retry(
+        total=retries,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        # Hand the last response back to the caller instead of raising, so status checks still apply
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_CONNECTIONS_PER_HOST,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(retry=True):
+    """Return this worker's pooled session, creating fresh ones after a fork.
+
+    retry=False returns a session that never retries, for callers that run their own retry policy.
+    """
+    global _session_pid
+    with _session_lock:
+        if _session_pid != os.getpid():
+            _sessions.clear()
+            _session_pid = os.getpid()
+        session = _sessions.get(retry)
+        if session is None:
+            session = _sessions[retry] = _build_session(HTTP_RETRIES if retry else 0)
+            logger.debug(f"Created pooled HTTP session (retry={retry}) for worker {_session_pid}")
+        return session
+
+
+def _with_default_timeout(kwargs):
+    kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    return kwargs
+
+
+def http_get(url, retry=True, **kwargs):
+    return get_session(retry).get(url, **_with_default_timeout(kwargs))
+
+
+def http_head(url, **kwargs):
+    return get_session().head(url, **_with_default_timeout(kwargs))
+
+
+def http_post(url, **kwargs):
+    return get_session().post(url, **_with_default_timeout(kwargs))
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from http_client import http_post
+
+logger = logging.getLogger(__name__)
+
+# "sqlite" lets every gunicorn worker answer status requests; "memory" is only visible to one process
+JOB_QUEUE_BACKEND = os.environ.get("JOB_QUEUE_BACKEND", "sqlite")
+JOB_QUEUE_DB = os.environ.get(
+    "JOB_QUEUE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "jobs.sqlite3"),
+)
+JOB_QUEUE_WORKERS = int(os.environ.get("JOB_QUEUE_WORKERS", 4))
+# Threads for short jobs a client is waiting on (resume uploads), kept apart from the minute-long report jobs
+JOB_QUEUE_STORAGE_WORKERS = int(os.environ.get("JOB_QUEUE_STORAGE_WORKERS", 4))
+# Comma-separated hosts that job callbacks may be posted to; empty turns callbacks off
+JOB_CALLBACK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.environ.get("JOB_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+# Seconds finished jobs are kept for status requests before they are deleted
+JOB_RETENTION_SECONDS = float(os.environ.get("JOB_RETENTION_SECONDS", 7 * 24 * 3600))
+# Seconds between retention sweeps in each worker
+JOB_PRUNE_INTERVAL = float(os.environ.get("JOB_PRUNE_INTERVAL", 3600))
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+def is_allowed_callback(url):
+    """Whether job results may be posted to url: an http(s) URL on one of JOB_CALLBACK_ALLOWED_HOSTS"""
+    if not isinstance(url, str):
+        return False
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and (parsed.hostname or "") in JOB_CALLBACK_ALLOWED_HOSTS
+
+
+class InMemoryJobStore:
+    """Job records kept in a dict; suitable for tests and single-process servers"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields, updated_at=time.time())
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def prune(self, before):
+        """Delete finished jobs last updated before the given timestamp; returns how many were deleted"""
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["status"] in FINISHED_STATUSES and job["updated_at"] < before
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+
+class SQLiteJobStore:
+    """Job records in a local SQLite file shared by all workers on the box"""
+
+    _COLUMNS = ("id", "kind", "status", "progress", "stage", "result", "error", "created_at", "updated_at")
+    _JSON_COLUMNS = ("result", "error")
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    stage TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _encode(self, fields):
+        return {
+            key: json.dumps(value) if key in self._JSON_COLUMNS and value is not None else value
+            for key, value in fields.items()
+        }
+
+    def create(self, job):
+        job = self._encode(job)
+        columns = [column for column in self._COLUMNS if column in job]
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [job[column] for column in columns],
+            )
+
+    def update(self, job_id, **fields):
+        fields = self._encode(dict(fields, updated_at=time.time()))
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{key} = ?' for key in fields)} WHERE id = ?",
+                list(fields.values()) + [job_id],
+            )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self._COLUMNS, row))
+        for column in self._JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def prune(self, before):
+        """Delete finished jobs last updated before the given timestamp; returns how many were deleted"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM jobs WHERE updated_at < ? AND status IN ({', '.join('?' for _ in FINISHED_STATUSES)})",
+                (before, *FINISHED_STATUSES),
+            )
+            return cursor.rowcount
+
+
+class JobError(Exception):
+    """Raised by job functions to fail a job with a client-facing error payload"""
+
+    def __init__(self, message, status_code=500, details=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+    def to_dict(self):
+        error = {"error": self.message}
+        if self.details is not None:
+            error["details"] = self.details
+        return error
+
+
+class JobQueue:
+    """Runs functions on local thread pools and records their progress in a pluggable store.
+
+    Jobs run in the "default" pool unless submitted to another one named in pool_sizes.
+    """
+
+    def __init__(self, store, max_workers=JOB_QUEUE_WORKERS, pool_sizes=None):
+        self.store = store
+        self.pool_sizes = {"default": max_workers, **(pool_sizes or {})}
+        self._executors = {}
+        self._executor_pid = None
+        self._next_prune = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self, pool):
+        # Threads do not survive a fork, so each worker process gets its own pools
+        with self._lock:
+            if self._executor_pid != os.getpid():
+                self._executors = {}
+                self._executor_pid = os.getpid()
+            executor = self._executors.get(pool)
+            if executor is None:
+                executor = self._executors[pool] = ThreadPoolExecutor(
+                    max_workers=self.pool_sizes[pool], thread_name_prefix=f"job-{pool}"
+                )
+            return executor
+
+    def submit(self, kind, func, *args, callback_url=None, pool="default", **kwargs):
+        """Queue func(*args, progress=..., **kwargs) on the named pool and return the new job's id.
+
+        callback_url must pass is_allowed_callback, otherwise ValueError is raised.
+        """
+        if callback_url and not is_allowed_callback(callback_url):
+            raise ValueError(f"Callback URL is not allowed: {callback_url}")
+        if pool not in self.pool_sizes:
+            raise ValueError(f"Unknown job pool: {pool}")
+        now = time.time()
+        self._prune_if_due(now)
+        job_id = uuid.uuid4().hex
+        self.store.create({
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "progress": 0,
+            "stage": "queued",
+            "created_at": now,
+            "updated_at": now,
+        })
+        self._get_executor(pool).submit(self._run, job_id, func, args, kwargs, callback_url)
+        logger.debug(f"Queued {kind} job {job_id}")
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def _prune_if_due(self, now):
+        with self._lock:
+            if now < self._next_prune:
+                return
+            self._next_prune = now + JOB_PRUNE_INTERVAL
+        try:
+            pruned = self.store.prune(now - JOB_RETENTION_SECONDS)
+        except Exception as e:
+            logger.error(f"Failed to prune finished jobs: {str(e)}")
+            return
+        if pruned:
+            logger.info(f"Pruned {pruned} finished jobs older than {JOB_RETENTION_SECONDS:.0f}s")
+
+    def _run(self, job_id, func, args, kwargs, callback_url):
+        def progress(percent, stage):
+            self.store.update(job_id, progress=percent, stage=stage)
+
+        self.store.update(job_id, status="running", stage="started")
+        try:
+            result = func(*args, progress=progress, **kwargs)
+            self.store.update(job_id, status="completed", progress=100, stage="completed", result=result)
+        except JobError as e:
+            logger.error(f"Job {job_id} failed: {e.message}")
+            self.store.update(job_id, status="failed", stage="failed", error=e.to_dict())
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self.store.update(job_id, status="failed", stage="failed", error={"error": str(e)})
+
+        if callback_url:
+            try:
+                http_post(callback_url, json=self.store.get(job_id))
+            except Exception as e:
+                logger.error(f"Failed to deliver callback for job {job_id} to {callback_url}: {str(e)}")
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Return the process-wide queue using the backend selected by JOB_QUEUE_BACKEND"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            if JOB_QUEUE_BACKEND == "memory":
+                store = InMemoryJobStore()
+            elif JOB_QUEUE_BACKEND == "sqlite":
+                store = SQLiteJobStore(JOB_QUEUE_DB)
+            else:
+                raise ValueError(f"Unknown JOB_QUEUE_BACKEND: {JOB_QUEUE_BACKEND}")
+            _queue = JobQueue(store, pool_sizes={"storage": JOB_QUEUE_STORAGE_WORKERS})
+        return _queue
@@ -0,0 +1,55 @@
+import os
+import logging
+import numpy as np
+from embedding_scorer import get_embedding_scorer
+
+logger = logging.getLogger(__name__)
+
+# "embedding" uses the sentence-transformers model shared with matching; "tfidf" needs no model at all
+RANKING_METHODS = ("embedding", "tfidf")
+JOB_RANKING_METHOD = os.environ.get("JOB_RANKING_METHOD", "embedding")
+
+# TF-IDF cosines between a resume and a short job snippet rarely exceed this, so it maps to a score of 100
+TFIDF_SCORE_CEILING = float(os.environ.get("TFIDF_SCORE_CEILING", 0.35))
+
+
+def job_text(job):
+    return f"{job.get('title') or ''}\n{job.get('description') or ''}"
+
+
+def _tfidf_similarities(resume_text, job_texts):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    # Rows come out L2-normalized, so the dot product with the resume row is the cosine similarity
+    matrix = TfidfVectorizer(stop_words="english", sublinear_tf=True).fit_transform([resume_text] + job_texts)
+    return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+
+def rank_jobs(jobs, method=JOB_RANKING_METHOD, resume_text=None, resume_vector=None):
+    """Return jobs sorted by fit to the resume, best first, each with match_score (0-100) and similarity.
+
+    The embedding method takes a precomputed resume_vector when one is available, otherwise resume_text.
+    """
+    if not jobs:
+        return []
+    texts = [job_text(job) for job in jobs]
+    if method == "embedding":
+        scorer = get_embedding_scorer()
+        if resume_vector is None:
+            resume_vector = scorer.embed_text(resume_text)
+        # All job descriptions are embedded in one batch and scored with a single matrix-vector product
+        similarities = scorer.embed_texts(texts) @ np.asarray(resume_vector, dtype=np.float32)
+        scores = scorer.similarity_to_score(similarities)
+    elif method == "tfidf":
+        similarities = _tfidf_similarities(resume_text, texts)
+        scores = np.rint(np.clip(similarities / TFIDF_SCORE_CEILING, 0.0, 1.0) * 100).astype(int)
+    else:
+        raise ValueError(f"Unknown ranking method: {method}")
+
+    # Stable, so equally good jobs keep Adzuna's order
+    order = np.argsort(-similarities, kind="stable")
+    logger.debug(f"Ranked {len(jobs)} jobs with {method}")
+    return [
+        dict(jobs[i], match_score=int(scores[i]), similarity=round(float(similarities[i]), 4))
+        for i in order
+    ]
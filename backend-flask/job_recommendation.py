@@ -1,28 +1,157 @@
-import requests
+import os
+import math
+import logging
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http_client import http_get
+from disk_cache import get_cache
 import time
 
+logger = logging.getLogger(__name__)
+
 # Adzuna API credentials
 APP_ID = "15342df4"
 APP_KEY = "b38d6d910bdc9e6a589efb28ba54ffbd"
-BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+BASE_URL = os.environ.get("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs")
 
 # API parameters
 COUNTRY = "in"
 RESULTS_PER_PAGE = 10
+# Adzuna rejects larger pages
+MAX_RESULTS_PER_PAGE = 50
+# Upper bound on extra pages fetched ahead of the one requested
+JOB_SEARCH_MAX_PREFETCH = int(os.environ.get("JOB_SEARCH_MAX_PREFETCH", 5))
 
-# Retry logic for Adzuna API request
-def get_job_listings(search_query, retries=3):
-    url = f"{BASE_URL}/{COUNTRY}/search/1"
+# Search results are shared by every worker for this long; a TTL of 0 disables the cache
+JOB_SEARCH_CACHE_TTL = int(os.environ.get("JOB_SEARCH_CACHE_TTL", 15 * 60))
+JOB_SEARCH_CACHE_MAX_BYTES = int(os.environ.get("JOB_SEARCH_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+# Queries served from the cache within this many seconds of expiring are refreshed in the background
+JOB_SEARCH_REFRESH_AHEAD = int(os.environ.get("JOB_SEARCH_REFRESH_AHEAD", 120))
+# Expired results are kept this much longer and served while a refresh runs or Adzuna is unavailable
+JOB_SEARCH_STALE_TTL = int(os.environ.get("JOB_SEARCH_STALE_TTL", 24 * 3600))
+JOB_SEARCH_RETRY_BASE_DELAY = float(os.environ.get("JOB_SEARCH_RETRY_BASE_DELAY", 0.5))
+JOB_SEARCH_RETRY_MAX_DELAY = float(os.environ.get("JOB_SEARCH_RETRY_MAX_DELAY", 8))
+
+
+class JobSearchUnavailable(Exception):
+    """Adzuna could not be reached (429, 503 or a network error) and nothing was cached for the search"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SingleFlight:
+    """Lets concurrent callers asking for the same key share one in-flight call"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(func())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+
+_search_flight = SingleFlight()
+# After 429/503s or network errors Adzuna is left alone until this backoff runs out; requests never wait for it
+_backoff = {"failures": 0, "until": 0.0}
+_backoff_lock = threading.Lock()
+_background_executor = None
+_background_executor_pid = None
+_background_lock = threading.Lock()
+# Keys with a refresh queued or running, so an outage does not queue the same search over and over
+_pending_refreshes = set()
+
+
+def _get_background_executor():
+    # Runs background refreshes and prefetches; threads do not survive a fork, so each worker gets its own
+    global _background_executor, _background_executor_pid
+    with _background_lock:
+        if _background_executor is None or _background_executor_pid != os.getpid():
+            _background_executor = ThreadPoolExecutor(max_workers=max(2, JOB_SEARCH_MAX_PREFETCH), thread_name_prefix="job-search")
+            _background_executor_pid = os.getpid()
+        return _background_executor
+
+
+def normalize_query(search_query):
+    return " ".join(search_query.lower().split())
+
+
+def _backoff_delay(attempt, response=None):
+    """Exponential backoff with full jitter, honouring Retry-After when Adzuna sends one"""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), JOB_SEARCH_RETRY_MAX_DELAY)
+    return random.uniform(0, min(JOB_SEARCH_RETRY_MAX_DELAY, JOB_SEARCH_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _backoff_remaining():
+    with _backoff_lock:
+        return _backoff["until"] - time.time()
+
+
+def _record_failure(response):
+    with _backoff_lock:
+        delay = _backoff_delay(_backoff["failures"], response)
+        _backoff["failures"] += 1
+        _backoff["until"] = time.time() + delay
+    logger.warning(f"Adzuna unavailable, backing off for {delay:.2f}s")
+
+
+def _record_success():
+    with _backoff_lock:
+        _backoff["failures"] = 0
+        _backoff["until"] = 0.0
+
+
+def _search_adzuna(search_query, page, page_size, attempts=1):
+    """Fetch one page of results from Adzuna as {"jobs", "count"}; returns None if Adzuna rejected the search.
+
+    Raises JobSearchUnavailable when every attempt hit a 429, 503 or network error, or the backoff was running.
+    Requests make a single attempt; only background refreshes pass attempts > 1 and wait out the backoff.
+    """
+    url = f"{BASE_URL}/{COUNTRY}/search/{page}"
     params = {
         "app_id": APP_ID,
         "app_key": APP_KEY,
-        "results_per_page": RESULTS_PER_PAGE,
+        "results_per_page": page_size,
         "what": search_query,
     }
 
-    for attempt in range(retries):
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
+    for _ in range(attempts):
+        remaining = _backoff_remaining()
+        if remaining > 0:
+            if attempts == 1:
+                logger.warning("Skipping Adzuna search while backing off")
+                break
+            time.sleep(remaining)
+        try:
+            # This function is the only retry layer, so the session must not retry as well
+            response = http_get(url, params=params, retry=False)
+        except Exception as e:
+            logger.error(f"Adzuna request failed: {e}")
+            response = None
+        if response is not None and response.status_code == 200:
+            _record_success()
             data = response.json()
             jobs = []
             for job in data.get("results", []):
@@ -33,12 +162,126 @@ def get_job_listings(search_query, retries=3):
                     "description": job.get("description"),
                     "url": job.get("redirect_url"),
                 })
-            return jobs
-        elif response.status_code == 503:
-            print("503 Error: Server unavailable. Retrying...")
-            time.sleep(5)  # Wait for 5 seconds before retrying
+            return {"jobs": jobs, "count": data.get("count")}
+        elif response is None or response.status_code in (429, 503):
+            _record_failure(response)
         else:
-            print(f"Error: {response.status_code} - {response.text}")
-            break
+            logger.error(f"Error: {response.status_code} - {response.text}")
+            return None
+
+    raise JobSearchUnavailable("Adzuna is unavailable", retry_after=max(1, math.ceil(_backoff_remaining())))
+
+
+def _cache_key(query, page, page_size):
+    return f"{page_size}:{page}:{query}"
+
+
+def _fetch_and_cache(query, page, page_size, attempts=1):
+    result = _search_adzuna(query, page, page_size, attempts)
+    if result is not None and JOB_SEARCH_CACHE_TTL > 0:
+        # Entries outlive their freshness so they can stand in while Adzuna is down
+        get_cache("jobs", JOB_SEARCH_CACHE_MAX_BYTES).set(
+            _cache_key(query, page, page_size), dict(result, fetched_at=time.time()),
+            ttl=JOB_SEARCH_CACHE_TTL + JOB_SEARCH_STALE_TTL,
+        )
+    return result
+
+
+def _refresh_in_background(query, page, page_size, retries):
+    key = _cache_key(query, page, page_size)
+    with _background_lock:
+        if key in _pending_refreshes:
+            return
+        _pending_refreshes.add(key)
+
+    def refresh():
+        try:
+            _search_flight.do(key, lambda: _fetch_and_cache(query, page, page_size, retries))
+        except Exception as e:
+            logger.error(f"Background refresh of job search {key!r} failed: {e}")
+        finally:
+            with _background_lock:
+                _pending_refreshes.discard(key)
+
+    get_cache("jobs", JOB_SEARCH_CACHE_MAX_BYTES).incr("refreshes")
+    _get_background_executor().submit(refresh)
+
+
+def get_job_page(search_query, page=1, page_size=RESULTS_PER_PAGE, retries=3):
+    """Return one page of Adzuna results as {"jobs", "count"}, cached per normalized query and shared by concurrent callers.
 
-    return []
\ No newline at end of file
+    Requests never sleep on Adzuna: when it is unavailable stale results are returned if there are any,
+    otherwise a background refresh with `retries` attempts is queued and JobSearchUnavailable is raised.
+    """
+    query = normalize_query(search_query)
+    key = _cache_key(query, page, page_size)
+    if JOB_SEARCH_CACHE_TTL > 0:
+        cache = get_cache("jobs", JOB_SEARCH_CACHE_MAX_BYTES)
+        cached = cache.get(key)
+        if cached is not None:
+            age = time.time() - cached["fetched_at"]
+            if age < JOB_SEARCH_CACHE_TTL:
+                cache.incr("hits")
+                # Hot queries are re-fetched shortly before they expire, so users never wait on Adzuna for them
+                if JOB_SEARCH_REFRESH_AHEAD and age > JOB_SEARCH_CACHE_TTL - JOB_SEARCH_REFRESH_AHEAD:
+                    _refresh_in_background(query, page, page_size, retries)
+                return {"jobs": cached["jobs"], "count": cached.get("count")}
+            # Expired: answer with what we have and refresh it off the request path
+            cache.incr("stale")
+            _refresh_in_background(query, page, page_size, retries)
+            return {"jobs": cached["jobs"], "count": cached.get("count")}
+        cache.incr("misses")
+
+    try:
+        result = _search_flight.do(key, lambda: _fetch_and_cache(query, page, page_size))
+    except JobSearchUnavailable:
+        # The retries happen off the request path, so the next request for this search is answered from the cache
+        _refresh_in_background(query, page, page_size, retries)
+        raise
+    return result if result is not None else {"jobs": [], "count": None}
+
+
+def iter_job_pages(search_query, page=1, page_size=RESULTS_PER_PAGE, prefetch=0, executor=None):
+    """Yield (page, {"jobs", "count"}) for the requested page and up to `prefetch` following pages, in order.
+
+    All pages are requested at once, so later pages load while earlier ones are being consumed.
+    """
+    pages = range(page, page + 1 + min(prefetch, JOB_SEARCH_MAX_PREFETCH))
+    own_executor = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=len(pages), thread_name_prefix="job-search")
+    try:
+        futures = [(number, executor.submit(get_job_page, search_query, number, page_size)) for number in pages]
+        for number, future in futures:
+            result = future.result()
+            yield number, result
+            # A short page is the last one; there is nothing further to show
+            if len(result["jobs"]) < page_size:
+                break
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def prefetch_job_pages(search_query, page, page_size, count):
+    """Warm the cache for the `count` pages after `page` without waiting for them"""
+    executor = _get_background_executor()
+    for number in range(page + 1, page + 1 + min(count, JOB_SEARCH_MAX_PREFETCH)):
+        executor.submit(get_job_page, search_query, number, page_size)
+
+
+def get_job_listings(search_query, retries=3):
+    """Return the first page of Adzuna results for a query; raises JobSearchUnavailable like get_job_page"""
+    return get_job_page(search_query, 1, RESULTS_PER_PAGE, retries)["jobs"]
+
+
+def get_job_search_cache_stats():
+    counters = get_cache("jobs", JOB_SEARCH_CACHE_MAX_BYTES).counters()
+    hits = counters.get("hits", 0)
+    misses = counters.get("misses", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "stale_served": counters.get("stale", 0),
+        "background_refreshes": counters.get("refreshes", 0),
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+    }
@@ -0,0 +1,60 @@
+import os
+import hashlib
+import logging
+from disk_cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+# A TTL of 0 disables the cache
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+def normalize_prompt(prompt):
+    # Prompts are built from indented f-strings, so whitespace carries no meaning
+    return " ".join(prompt.split())
+
+
+def prompt_cache_key(model_name, prompt):
+    return hashlib.sha256(f"{model_name}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+def get_cached_text(model_name, prompt):
+    """Return the cached response text for (model, prompt), or None on a miss or when the cache is disabled"""
+    if LLM_CACHE_TTL <= 0:
+        return None
+    cache = get_cache("llm", LLM_CACHE_MAX_BYTES)
+    key = prompt_cache_key(model_name, prompt)
+    cached = cache.get(key)
+    if cached is None:
+        cache.incr("misses")
+        return None
+    cache.incr("hits")
+    logger.debug(f"LLM cache hit for {model_name} prompt {key[:12]}")
+    return cached["text"]
+
+
+def cache_text(model_name, prompt, text):
+    if LLM_CACHE_TTL > 0:
+        get_cache("llm", LLM_CACHE_MAX_BYTES).set(prompt_cache_key(model_name, prompt), {"text": text}, ttl=LLM_CACHE_TTL)
+
+
+def generate_cached(model_name, prompt, generate):
+    """Return the cached response text for (model, prompt), calling generate(prompt) on a miss"""
+    cached = get_cached_text(model_name, prompt)
+    if cached is not None:
+        return cached
+    text = generate(prompt)
+    cache_text(model_name, prompt, text)
+    return text
+
+
+def get_llm_cache_stats():
+    counters = get_cache("llm", LLM_CACHE_MAX_BYTES).counters()
+    hits = counters.get("hits", 0)
+    misses = counters.get("misses", 0)
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+    }
@@ -0,0 +1,117 @@
+import os
+import logging
+import threading
+import google.generativeai as genai
+from dotenv import load_dotenv
+from llm_cache import generate_cached, get_cached_text, cache_text
+from llm_schemas import json_generation_config, parse_structured
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# GEMINI_API_ENDPOINT swaps in another Gemini-compatible REST server, e.g. the load-test stand-in
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+GEMINI_ANALYSIS_MODEL = os.getenv("GEMINI_ANALYSIS_MODEL", GEMINI_MODEL)
+GEMINI_MATCH_MODEL = os.getenv("GEMINI_MATCH_MODEL", GEMINI_MODEL)
+# Seconds before a Gemini call is abandoned
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", 60))
+# Gemini calls in flight per worker; further callers wait up to LLM_REQUEST_TIMEOUT for a slot
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+
+_models = {}
+_semaphore = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def _ensure_client():
+    # gRPC channels do not survive a fork, so each worker configures the client and builds its models itself
+    global _models, _semaphore, _client_pid
+    if _client_pid == os.getpid():
+        return
+    with _client_lock:
+        if _client_pid == os.getpid():
+            return
+        if not GOOGLE_API_KEY:
+            raise ValueError("Google API key is not configured. Please set GOOGLE_API_KEY in your .env file.")
+        if GEMINI_API_ENDPOINT:
+            genai.configure(api_key=GOOGLE_API_KEY, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+        else:
+            genai.configure(api_key=GOOGLE_API_KEY)
+        _models = {}
+        _semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+        _client_pid = os.getpid()
+        logger.debug(f"Configured Gemini client for pid {_client_pid}")
+
+
+def configure():
+    """Configure the Gemini client for this process; raises ValueError without an API key"""
+    _ensure_client()
+
+
+def get_model(model_name=GEMINI_MODEL):
+    """Return this worker's shared GenerativeModel for model_name"""
+    _ensure_client()
+    with _client_lock:
+        model = _models.get(model_name)
+        if model is None:
+            model = _models[model_name] = genai.GenerativeModel(model_name)
+        return model
+
+
+class _Slot:
+    """Holds one of the worker's Gemini concurrency slots"""
+
+    def __enter__(self):
+        _ensure_client()
+        self._semaphore = _semaphore
+        if not self._semaphore.acquire(timeout=LLM_REQUEST_TIMEOUT):
+            raise TimeoutError(f"Timed out waiting for one of {LLM_MAX_CONCURRENCY} Gemini slots")
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+
+
+def _generate(model_name, prompt, generation_config=None):
+    with _Slot():
+        return get_model(model_name).generate_content(
+            prompt, generation_config=generation_config, request_options={"timeout": LLM_REQUEST_TIMEOUT}
+        ).text
+
+
+def generate_text(prompt, model_name=GEMINI_MODEL, schema=None):
+    """Return Gemini's answer to prompt, from the LLM cache when the same prompt was answered before.
+
+    With a pydantic schema the answer is requested in JSON mode, validated, and cached apart from text answers.
+    """
+    if schema is None:
+        return generate_cached(model_name, prompt, lambda prompt: _generate(model_name, prompt))
+    generation_config = json_generation_config(schema)
+    return generate_cached(
+        f"{model_name}:json", prompt,
+        lambda prompt: parse_structured(schema, _generate(model_name, prompt, generation_config))
+    )
+
+
+def stream_text(prompt, model_name=GEMINI_MODEL):
+    """Yield Gemini's answer to prompt in pieces as it is generated; a cached answer is yielded whole"""
+    cached = get_cached_text(model_name, prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    text = ""
+    # The slot is held until the stream is exhausted, since the call is in flight until then
+    with _Slot():
+        response = get_model(model_name).generate_content(
+            prompt, stream=True, request_options={"timeout": LLM_REQUEST_TIMEOUT}
+        )
+        for chunk in response:
+            text += chunk.text
+            yield chunk.text
+    cache_text(model_name, prompt, text.strip())
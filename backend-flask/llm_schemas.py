@@ -0,0 +1,103 @@
+import os
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+import google.generativeai as genai
+
+# "text" asks Gemini for markdown and reads the scores back out of it, "json" has Gemini fill in the schemas below
+LLM_OUTPUT_MODES = ("text", "json")
+LLM_OUTPUT_MODE = os.environ.get("LLM_OUTPUT_MODE", "text")
+
+# Gemini's schema format has no defaults or bounds, so optional fields are nullable and scores are clamped on parse
+
+
+def _clamp_score(score):
+    return max(0, min(score, 100))
+
+
+class SkillGroup(BaseModel):
+    category: str = Field(description="Kind of skill, e.g. technical, soft or domain-specific")
+    skills: list[str]
+
+
+class ResumeAnalysis(BaseModel):
+    """Comprehensive analysis of a resume"""
+
+    overall_assessment: str = Field(description="Overall quality, formatting, organization and general impression")
+    professional_profile: str = Field(description="Experience trajectory and career narrative")
+    current_skills: list[SkillGroup] = Field(description="Every skill the resume demonstrates, grouped by kind")
+    skill_proficiency: str = Field(description="Apparent level of expertise in the key skills")
+    missing_skills: list[str] = Field(description="Skills that would improve the resume for the target role, each with why it matters")
+    experience_analysis: str = Field(description="Use of action verbs, quantified achievements and relevance, with improvements")
+    education_analysis: str = Field(description="Relevance of degrees and certifications and what is missing")
+    key_strengths: list[str] = Field(description="5-7 specific strengths and why they are effective")
+    areas_for_improvement: list[str] = Field(description="5-7 specific, actionable improvements")
+    ats_score: int = Field(description="How well the resume is optimized for applicant tracking systems, 0-100")
+    ats_recommendations: str = Field(description="Keywords and formatting changes that would raise the ATS score")
+    recommended_courses: list[str] = Field(description="5-7 courses or certifications and why each would help")
+    resume_score: int = Field(
+        description="Overall quality, 0-100: below 60 has significant issues, 60-75 average, 75-85 good, 85-100 excellent"
+    )
+    role_alignment: Optional[str] = Field(description="Alignment with the target role and how to improve it; null without a role")
+    job_match: Optional[str] = Field(description="Match against the job description with a match percentage; null without one")
+    unmet_job_requirements: Optional[list[str]] = Field(
+        description="Job requirements the resume does not address, with how to address each; null without a job description"
+    )
+
+    @field_validator("ats_score", "resume_score")
+    @classmethod
+    def clamp_score(cls, score):
+        return _clamp_score(score)
+
+
+class MatchScore(BaseModel):
+    """How well a resume matches a job"""
+
+    match_score: int = Field(
+        description="Match from 0 to 100: below 60 is poor, 60-75 average, 75-85 good, 85-100 excellent"
+    )
+
+    @field_validator("match_score")
+    @classmethod
+    def clamp_score(cls, score):
+        return _clamp_score(score)
+
+
+def json_generation_config(schema):
+    return genai.GenerationConfig(response_mime_type="application/json", response_schema=schema)
+
+
+def parse_structured(schema, text):
+    """Validate Gemini's JSON against schema and return it re-serialized, so only well-formed answers are cached"""
+    return schema.model_validate_json(text).model_dump_json()
+
+
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items)
+
+
+def render_analysis_markdown(analysis):
+    """Render a ResumeAnalysis in the markdown layout of text mode, for clients that display `analysis` as-is"""
+    skills = "\n".join(f"  - {group.category}: {', '.join(group.skills)}" for group in analysis.current_skills)
+    sections = [
+        ("Overall Assessment", analysis.overall_assessment),
+        ("Professional Profile Analysis", analysis.professional_profile),
+        ("Skills Analysis", (
+            f"- **Current Skills**:\n{skills}\n"
+            f"- **Skill Proficiency**: {analysis.skill_proficiency}\n"
+            f"- **Missing Skills**:\n" + "\n".join(f"  - {skill}" for skill in analysis.missing_skills)
+        )),
+        ("Experience Analysis", analysis.experience_analysis),
+        ("Education Analysis", analysis.education_analysis),
+        ("Key Strengths", _bullets(analysis.key_strengths)),
+        ("Areas for Improvement", _bullets(analysis.areas_for_improvement)),
+        ("ATS Optimization Assessment", f"ATS Score: {analysis.ats_score}/100\n\n{analysis.ats_recommendations}"),
+        ("Recommended Courses/Certifications", _bullets(analysis.recommended_courses)),
+        ("Resume Score", f"Resume Score: {analysis.resume_score}/100"),
+    ]
+    if analysis.role_alignment:
+        sections.append(("Role Alignment Analysis", analysis.role_alignment))
+    if analysis.job_match:
+        sections.append(("Job Match Analysis", analysis.job_match))
+    if analysis.unmet_job_requirements:
+        sections.append(("Key Job Requirements Not Met", _bullets(analysis.unmet_job_requirements)))
+    return "\n\n".join(f"## {title}\n{body}" for title, body in sections)
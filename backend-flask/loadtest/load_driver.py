@@ -0,0 +1,246 @@
+"""Drive concurrent load at the Flask API and report requests/s and latency percentiles per endpoint.
+
+Usage:
+    # Start the mock services and gunicorn (with gunicorn_config.py) and load them
+    python loadtest/load_driver.py --spawn --workers 4 --concurrency 16 --duration 30
+
+    # Load an already running app that points at an already running mock server
+    python loadtest/load_driver.py --target http://127.0.0.1:5001 --mock-url http://127.0.0.1:5100
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_services import env_for, sample_resume_url, build_resume_pdf, SAMPLE_GITHUB_USER
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = ("upload_resume", "match_resume_job", "recommend_jobs", "generate_report")
+SEARCH_QUERIES = ["python developer", "data engineer", "frontend developer", "devops", "machine learning"]
+JOB_DESCRIPTIONS = [
+    "Backend engineer with Python, Flask and PostgreSQL experience, building REST APIs at scale.",
+    "Frontend developer skilled in React and TypeScript with an eye for accessible design.",
+    "DevOps engineer with Docker, Kubernetes and Terraform experience on AWS.",
+]
+SKILLS = ["Python", "Flask", "React", "Docker", "PostgreSQL", "Go", "Kubernetes", "TypeScript", "AWS", "Redis"]
+
+
+class Scenario:
+    """Builds one request for an endpoint; resume PDFs are generated up front so uploads are not all identical"""
+
+    def __init__(self, mock_url, unique_resumes):
+        self.resume_url = sample_resume_url(mock_url)
+        rng = random.Random(7)
+        self.resumes = [
+            build_resume_pdf(f"Candidate {index}", SAMPLE_GITHUB_USER, rng.sample(SKILLS, 5), seed=index)
+            for index in range(unique_resumes)
+        ]
+
+    def request(self, endpoint, rng):
+        if endpoint == "upload_resume":
+            return "POST", "/upload_resume", {
+                "params": {"job_role": "Software Engineer"},
+                "files": {"resume": ("resume.pdf", rng.choice(self.resumes), "application/pdf")},
+            }
+        if endpoint == "match_resume_job":
+            return "POST", "/match_resume_job", {"json": {
+                "resumeFilePath": self.resume_url,
+                "jobDescription": rng.choice(JOB_DESCRIPTIONS),
+                "jobRole": "Software Engineer",
+            }}
+        if endpoint == "recommend_jobs":
+            return "POST", "/recommend-jobs", {"json": {"search_query": rng.choice(SEARCH_QUERIES)}}
+        if endpoint == "generate_report":
+            return "POST", "/report/generate-report", {"json": {
+                "resumeFilePath": self.resume_url,
+                "min_salary": 600000,
+                "max_salary": 2400000,
+            }}
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_endpoint(target, scenario, endpoint, concurrency, duration, max_requests, timeout):
+    """Hammer one endpoint from `concurrency` threads until the duration or request budget runs out"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    issued = [0]
+
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            with lock:
+                if max_requests and issued[0] >= max_requests:
+                    return
+                issued[0] += 1
+            method, path, kwargs = scenario.request(endpoint, rng)
+            started = time.perf_counter()
+            try:
+                status = str(session.request(method, f"{target}{path}", timeout=timeout, **kwargs).status_code)
+            except requests.RequestException as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    wall = time.monotonic() - started
+
+    succeeded = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "requests": len(latencies),
+        "succeeded": succeeded,
+        "failed": len(latencies) - succeeded,
+        "statuses": statuses,
+        "requests_per_second": round(len(latencies) / wall, 2) if wall else None,
+        "latency_ms": {
+            f"p{percent}": round(_percentile(latencies, percent) * 1000, 1) if latencies else None
+            for percent in (50, 90, 95, 99)
+        },
+        "max_latency_ms": round(max(latencies) * 1000, 1) if latencies else None,
+    }
+
+
+def _wait_until_up(url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.5)
+    raise SystemExit(f"Timed out waiting for {url}")
+
+
+def spawn_stack(args, state_dir):
+    """Start the mock services and gunicorn with gunicorn_config.py, returning (processes, target, mock_url)"""
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    mock_command = [sys.executable, os.path.join(BACKEND_DIR, "loadtest", "mock_services.py"), "--port", str(args.mock_port)]
+    if args.mock_latency:
+        mock_command += ["--latency", args.mock_latency]
+    if args.mock_error_rate:
+        mock_command += ["--error-rate", args.mock_error_rate]
+    log = open(os.path.join(state_dir, "stack.log"), "w")
+    processes = [subprocess.Popen(mock_command, stdout=log, stderr=log)]
+    _wait_until_up(f"{mock_url}/_stats", 30)
+
+    env = dict(os.environ, **env_for(mock_url))
+    env.update({
+        # Fresh caches so every run starts cold and results are comparable
+        "CACHE_DIR": os.path.join(state_dir, "cache"),
+        "RESUME_INDEX_DIR": os.path.join(state_dir, "resume_index"),
+        "JOB_QUEUE_DB": os.path.join(state_dir, "jobs.sqlite3"),
+        "REPORT_ASSET_WARMUP": "0",
+        "HF_HUB_OFFLINE": "1",
+    })
+    gunicorn_command = [
+        sys.executable, "-m", "gunicorn", "-c", "gunicorn_config.py",
+        "-b", f"127.0.0.1:{args.app_port}", "--log-level", "warning",
+    ]
+    if args.workers:
+        gunicorn_command += ["-w", str(args.workers)]
+    if args.worker_class:
+        gunicorn_command += ["-k", args.worker_class]
+        # gunicorn_config.py reads this to decide whether to set up gRPC for gevent
+        env["GUNICORN_WORKER_CLASS"] = args.worker_class
+    if args.threads:
+        gunicorn_command += ["--threads", str(args.threads)]
+    processes.append(subprocess.Popen(gunicorn_command + ["app:app"], cwd=BACKEND_DIR, env=env, stdout=log, stderr=log))
+    target = f"http://127.0.0.1:{args.app_port}"
+    _wait_until_up(f"{target}/cache/stats", 120)
+    return processes, target, mock_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="http://127.0.0.1:5001", help="Base URL of a running app")
+    parser.add_argument("--mock-url", default="http://127.0.0.1:5100", help="Base URL of a running mock server")
+    parser.add_argument("--spawn", action="store_true", help="Start the mock services and gunicorn locally")
+    parser.add_argument("--workers", type=int, help="Override the gunicorn worker count when spawning")
+    parser.add_argument("--worker-class", help="Override the gunicorn worker class when spawning (gthread, gevent, sync)")
+    parser.add_argument("--threads", type=int, help="Override the gthread thread count when spawning")
+    parser.add_argument("--app-port", type=int, default=5001)
+    parser.add_argument("--mock-port", type=int, default=5100)
+    parser.add_argument("--mock-latency", help="Passed to mock_services.py --latency")
+    parser.add_argument("--mock-error-rate", help="Passed to mock_services.py --error-rate")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load per endpoint")
+    parser.add_argument("--requests", type=int, default=0, help="Stop an endpoint after this many requests")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--unique-resumes", type=int, default=20)
+    parser.add_argument("--output", default="load_test_results.json")
+    args = parser.parse_args()
+
+    processes = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        try:
+            target, mock_url = args.target, args.mock_url
+            if args.spawn:
+                processes, target, mock_url = spawn_stack(args, state_dir)
+            scenario = Scenario(mock_url, args.unique_resumes)
+
+            results = {
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "platform": platform.platform(),
+                "target": target,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "workers": args.workers,
+                "worker_class": args.worker_class,
+                "threads": args.threads,
+                "endpoints": {},
+            }
+            for endpoint in args.endpoints.split(","):
+                print(f"Loading {endpoint} with {args.concurrency} clients...", file=sys.stderr)
+                results["endpoints"][endpoint] = run_endpoint(
+                    target, scenario, endpoint, args.concurrency, args.duration, args.requests, args.timeout
+                )
+            try:
+                results["mock_stats"] = requests.get(f"{mock_url}/_stats", timeout=5).json()
+            except requests.RequestException:
+                pass
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait(timeout=30)
+
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    for endpoint, summary in results["endpoints"].items():
+        latency = summary["latency_ms"]
+        print(
+            f"{endpoint:<18} {summary['requests_per_second']:>8} req/s  ok {summary['succeeded']:>5}  "
+            f"failed {summary['failed']:>4}  p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms"
+        )
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
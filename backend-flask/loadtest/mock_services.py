@@ -0,0 +1,376 @@
+"""Local stand-ins for Gemini, the GitHub REST API, Cloudinary and Adzuna, for offline load tests.
+
+Usage:
+    python loadtest/mock_services.py --port 5100 --latency gemini=1.5,github=0.08 --error-rate gemini=0.02
+
+Every service lives under its own path prefix on one server; point the app at it with the variables
+printed by --print-env (or let load_driver.py --spawn do it).
+"""
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlencode
+from flask import Flask, request, jsonify, Response
+
+SERVICES = ("gemini", "github", "cloudinary", "adzuna")
+SAMPLE_RESUME_PATH = "demo/raw/upload/v1/resumes/sample-resume.pdf"
+SAMPLE_GITHUB_USER = "loadtest-user"
+
+app = Flask(__name__)
+
+settings = {
+    "base_url": "http://127.0.0.1:5100",
+    "latency": {service: 0.0 for service in SERVICES},
+    "jitter": 0.0,
+    "error_rate": {service: 0.0 for service in SERVICES},
+    "github_repos": 12,
+}
+stats = {service: {"requests": 0, "errors": 0} for service in SERVICES}
+stats_lock = threading.Lock()
+stored_files = {}
+
+
+def env_for(base_url):
+    """Environment variables that point the Flask app at a mock server running at base_url"""
+    return {
+        "GEMINI_API_ENDPOINT": base_url,
+        "GOOGLE_API_KEY": "loadtest",
+        "GITHUB_API_URL": f"{base_url}/github",
+        "GITHUB_TOKEN": "loadtest",
+        "CLOUDINARY_UPLOAD_PREFIX": f"{base_url}/cloudinary",
+        "CLOUDINARY_CLOUD_NAME": "demo",
+        "CLOUDINARY_API_KEY": "loadtest",
+        "CLOUDINARY_API_SECRET": "loadtest",
+        "RESUME_URL_PREFIX": f"{base_url}/res",
+        "ADZUNA_BASE_URL": f"{base_url}/adzuna",
+    }
+
+
+def sample_resume_url(base_url):
+    return f"{base_url}/res/{SAMPLE_RESUME_PATH}"
+
+
+def build_resume_pdf(name, github_user, skills, seed=0):
+    """Render a small text resume with a GitHub link, as the app expects for reports"""
+    from fpdf import FPDF
+
+    rng = random.Random(seed)
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, name, ln=1)
+    pdf.set_font("Arial", size=11)
+    pdf.cell(0, 7, f"{name.split()[0].lower()}@example.com", ln=1)
+    pdf.cell(0, 7, f"https://github.com/{github_user}", ln=1, link=f"https://github.com/{github_user}")
+    pdf.ln(4)
+    pdf.multi_cell(0, 7, "Skills: " + ", ".join(skills))
+    for year in range(2024, 2024 - rng.randint(2, 4), -1):
+        pdf.multi_cell(0, 7, f"{year}: Software Engineer. Built services in {rng.choice(skills)} and {rng.choice(skills)}.")
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def _simulate(service, wait=True):
+    """Apply the configured latency and return an error response for the configured share of requests.
+
+    With wait=False the latency is returned instead of slept, for handlers that spread it over a stream.
+    """
+    delay = settings["latency"][service] + random.uniform(0, settings["jitter"])
+    if delay and wait:
+        time.sleep(delay)
+    failed = random.random() < settings["error_rate"][service]
+    with stats_lock:
+        stats[service]["requests"] += 1
+        stats[service]["errors"] += int(failed)
+    if failed:
+        return jsonify({"error": {"code": 503, "message": f"Simulated {service} outage", "status": "UNAVAILABLE"}}), 503
+    return None if wait else delay
+
+
+def _score(text, low=40, high=95):
+    digest = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+    return low + digest % (high - low + 1)
+
+
+# --- Gemini (REST transport: POST /v1beta/models/<model>:generateContent or :streamGenerateContent) ---
+
+def _gemini_text(prompt):
+    if "Match Score" in prompt:
+        return f"Match Score: {_score(prompt)}/100"
+    return (
+        "## Overall Summary\nA solid engineering resume with measurable impact.\n\n"
+        f"## ATS Optimization Assessment\nATS Score: {_score(prompt[::-1])}/100\n\n"
+        "## Recommended Improvements\n- Quantify more achievements\n\n"
+        f"## Resume Score\nResume Score: {_score(prompt)}/100\n"
+    )
+
+
+# Schema types arrive as names or, with the REST transport's int enum encoding, as numbers
+_SCHEMA_TYPES = {1: "STRING", 2: "NUMBER", 3: "INTEGER", 4: "BOOLEAN", 5: "ARRAY", 6: "OBJECT"}
+
+
+def _fill_schema(schema, prompt, name=""):
+    """Build a plausible value for a JSON-mode response schema"""
+    kind = schema.get("type", schema.get("type_"))
+    kind = _SCHEMA_TYPES.get(kind, str(kind).upper())
+    if kind == "OBJECT":
+        return {key: _fill_schema(value, prompt, key) for key, value in schema.get("properties", {}).items()}
+    if kind == "ARRAY":
+        return [_fill_schema(schema.get("items", {}), prompt, name) for _ in range(2)]
+    if kind in ("INTEGER", "NUMBER"):
+        return _score(name + prompt)
+    if kind == "BOOLEAN":
+        return True
+    return f"Mock {name.replace('_', ' ') or 'text'}."
+
+
+def _gemini_candidate(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}]}
+
+
+@app.route("/v1beta/models/<path:model_action>", methods=["POST"])
+def gemini_generate(model_action):
+    stream = model_action.endswith(":streamGenerateContent")
+    outcome = _simulate("gemini", wait=not stream)
+    if isinstance(outcome, tuple):
+        return outcome
+    body = request.get_json(silent=True) or {}
+    prompt = " ".join(
+        part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])
+    )
+    generation_config = body.get("generationConfig") or body.get("generation_config") or {}
+    schema = generation_config.get("responseSchema") or generation_config.get("response_schema")
+    text = json.dumps(_fill_schema(schema, prompt)) if schema else _gemini_text(prompt)
+    usage = {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4}
+    if not stream:
+        return jsonify(dict(_gemini_candidate(text), usageMetadata=usage))
+
+    # The REST transport streams a JSON array of responses, one per section; the latency is spread across them
+    chunks = [chunk for chunk in text.split("\n\n") if chunk]
+
+    def generate():
+        yield "["
+        for index, chunk in enumerate(chunks):
+            time.sleep(outcome / len(chunks))
+            payload = _gemini_candidate(chunk + "\n\n")
+            if index == len(chunks) - 1:
+                payload["usageMetadata"] = usage
+            yield ("," if index else "") + json.dumps(payload)
+        yield "]"
+
+    return Response(generate(), mimetype="application/json")
+
+
+# --- GitHub REST API ---
+
+def _github_json(payload, links=None):
+    data = json.dumps(payload)
+    etag = '"' + hashlib.sha1(data.encode("utf-8")).hexdigest() + '"'
+    headers = {
+        "ETag": etag,
+        "X-RateLimit-Resource": "search" if request.path.startswith("/github/search") else "core",
+        "X-RateLimit-Remaining": "4999",
+        "X-RateLimit-Reset": str(int(time.time()) + 3600),
+    }
+    if links:
+        headers["Link"] = ", ".join(f'<{url}>; rel="{rel}"' for rel, url in links.items())
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers=headers)
+    return Response(data, status=200, mimetype="application/json", headers=headers)
+
+
+def _repo_names(username):
+    return [f"{username}-repo-{index}" for index in range(settings["github_repos"])]
+
+
+def _paginate(items):
+    per_page = int(request.args.get("per_page", 30))
+    page = int(request.args.get("page", 1))
+    last_page = max(1, -(-len(items) // per_page))
+    links = {}
+    if page < last_page:
+        query = dict(request.args, page=last_page)
+        links["last"] = f"{settings['base_url']}{request.path}?{urlencode(query)}"
+    return items[(page - 1) * per_page:page * per_page], links
+
+
+@app.route("/github/users/<username>/repos")
+def github_repos(username):
+    error = _simulate("github")
+    if error:
+        return error
+    languages = ["Python", "JavaScript", "TypeScript", "Go", None]
+    return _github_json([
+        {
+            "name": name,
+            "language": languages[index % len(languages)],
+            "languages_url": f"{settings['base_url']}/github/repos/{username}/{name}/languages",
+            "fork": index % 5 == 4,
+        }
+        for index, name in enumerate(_repo_names(username))
+    ])
+
+
+@app.route("/github/repos/<username>/<repo>/commits")
+def github_commits(username, repo):
+    error = _simulate("github")
+    if error:
+        return error
+    commits = [
+        {"sha": f"{index:040x}", "author": {"login": username}, "commit": {"author": {"name": username}}}
+        for index in range(_score(repo, 5, 250))
+    ]
+    page, links = _paginate(commits)
+    return _github_json(page, links)
+
+
+@app.route("/github/repos/<username>/<repo>/pulls")
+def github_pulls(username, repo):
+    error = _simulate("github")
+    if error:
+        return error
+    pulls = [{"number": index, "user": {"login": username}} for index in range(_score(repo, 0, 40))]
+    page, links = _paginate(pulls)
+    return _github_json(page, links)
+
+
+@app.route("/github/repos/<username>/<repo>/actions/workflows")
+def github_workflows(username, repo):
+    error = _simulate("github")
+    if error:
+        return error
+    count = _score(repo, 0, 4)
+    return _github_json({"total_count": count, "workflows": [{"id": index} for index in range(count)]})
+
+
+@app.route("/github/repos/<username>/<repo>/languages")
+def github_languages(username, repo):
+    error = _simulate("github")
+    if error:
+        return error
+    return _github_json({"Python": _score(repo, 1000, 90000), "Shell": _score(repo[::-1], 100, 5000)})
+
+
+@app.route("/github/search/issues")
+def github_search_issues():
+    error = _simulate("github")
+    if error:
+        return error
+    query = dict(part.split(":", 1) for part in request.args.get("q", "").split() if ":" in part)
+    username = query.get("author", SAMPLE_GITHUB_USER)
+    items = [
+        {"repository_url": f"{settings['base_url']}/github/repos/{username}/{name}"}
+        for name in _repo_names(username)
+        for _ in range(_score(name, 0, 8))
+    ]
+    page, _ = _paginate(items)
+    return _github_json({"total_count": len(items), "incomplete_results": False, "items": page})
+
+
+# --- Cloudinary upload API and delivery URLs ---
+
+@app.route("/cloudinary/v1_1/<cloud_name>/<resource_type>/upload", methods=["POST"])
+def cloudinary_upload(cloud_name, resource_type):
+    error = _simulate("cloudinary")
+    if error:
+        return error
+    uploaded = request.files.get("file")
+    content = uploaded.read() if uploaded else request.form.get("file", "").encode("utf-8")
+    public_id = "/".join(part for part in (request.form.get("folder"), request.form.get("public_id")) if part)
+    path = f"{cloud_name}/{resource_type}/upload/v1/{public_id}"
+    stored_files[path] = content
+    return jsonify({
+        "public_id": public_id,
+        "resource_type": resource_type,
+        "bytes": len(content),
+        "access_mode": "public",
+        "secure_url": f"{settings['base_url']}/res/{path}",
+    })
+
+
+@app.route("/res/<path:path>", methods=["GET", "HEAD"])
+def cloudinary_delivery(path):
+    error = _simulate("cloudinary")
+    if error:
+        return error
+    content = stored_files.get(path)
+    if content is None:
+        return jsonify({"error": "Resource not found"}), 404
+    return Response(content, mimetype="application/pdf")
+
+
+# --- Adzuna job search ---
+
+@app.route("/adzuna/<country>/search/<int:page>")
+def adzuna_search(country, page):
+    error = _simulate("adzuna")
+    if error:
+        return error
+    what = request.args.get("what", "")
+    per_page = int(request.args.get("results_per_page", 10))
+    return jsonify({
+        "count": 1000,
+        "results": [
+            {
+                "title": f"{what.title() or 'Software'} Engineer {index}",
+                "company": {"display_name": f"Company {index % 7}"},
+                "location": {"display_name": "Bengaluru, Karnataka"},
+                "description": f"Looking for a {what} engineer with Python, Flask and cloud experience.",
+                "redirect_url": f"https://example.com/jobs/{country}/{page}/{index}",
+            }
+            for index in range((page - 1) * per_page, page * per_page)
+        ],
+    })
+
+
+@app.route("/_stats")
+def mock_stats():
+    with stats_lock:
+        return jsonify(stats)
+
+
+def _parse_per_service(value, option):
+    result = {}
+    for item in filter(None, (value or "").split(",")):
+        service, _, number = item.partition("=")
+        if service not in SERVICES:
+            raise SystemExit(f"{option}: unknown service {service!r}, expected one of {', '.join(SERVICES)}")
+        result[service] = float(number)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--latency", help="Per-service latency in seconds, e.g. gemini=1.5,github=0.08")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency in seconds")
+    parser.add_argument("--error-rate", help="Per-service share of failed requests, e.g. gemini=0.02")
+    parser.add_argument("--github-repos", type=int, default=12)
+    parser.add_argument("--print-env", action="store_true", help="Print the app environment and exit")
+    args = parser.parse_args()
+
+    base_url = f"http://{args.host}:{args.port}"
+    if args.print_env:
+        for key, value in env_for(base_url).items():
+            print(f"export {key}={value}")
+        return 0
+
+    settings["base_url"] = base_url
+    settings["latency"].update(_parse_per_service(args.latency, "--latency"))
+    settings["error_rate"].update(_parse_per_service(args.error_rate, "--error-rate"))
+    settings["jitter"] = args.jitter
+    settings["github_repos"] = args.github_repos
+    stored_files[SAMPLE_RESUME_PATH] = build_resume_pdf(
+        "Sample Candidate", SAMPLE_GITHUB_USER, ["Python", "Flask", "React", "Docker", "PostgreSQL"]
+    )
+    print(f"Mock services listening on {base_url}", file=sys.stderr)
+    app.run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError
+import pypdfium2 as pdfium
+from pdf2image import convert_from_bytes
+import pytesseract
+
+logger = logging.getLogger(__name__)
+
+OCR_DPI = int(os.environ.get("OCR_DPI", 200))
+OCR_GRAYSCALE = os.environ.get("OCR_GRAYSCALE", "1") == "1"
+# OCR processes per web worker, so one document's pages can run on every core; processes are only started
+# when pages are waiting, so idle workers hold few of them
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", os.cpu_count() or 1))
+# Documents OCRed at once per web worker; later ones wait for a slot so their pages never queue behind
+# another document's and use up their own time budget there
+OCR_MAX_DOCUMENTS = int(os.environ.get("OCR_MAX_DOCUMENTS", 1))
+# Seconds a document may wait for a slot before it is given up on
+OCR_QUEUE_TIMEOUT = float(os.environ.get("OCR_QUEUE_TIMEOUT", 60))
+# Wall-clock budget for one document, counted from when its pages start; pages not finished by then are
+# stopped and left out of the text
+OCR_TIME_BUDGET = float(os.environ.get("OCR_TIME_BUDGET", 45))
+
+# Pages with fewer characters than this in their text layer are treated as scanned images
+SCANNED_PAGE_MIN_CHARS = 20
+SCANNED_SAMPLE_PAGES = 2
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_document_slots = threading.BoundedSemaphore(OCR_MAX_DOCUMENTS)
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # Spawned children do not inherit the web worker's threads, locks or sockets
+            _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _ocr_page(pdf_bytes, page_number, dpi, grayscale, deadline):
+    # A queued page may start after the budget is spent, and a running one must not outlive it, so both
+    # poppler and tesseract get whatever time is left; they kill their subprocesses when it runs out
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise TimeoutError(f"OCR time budget spent before page {page_number} started")
+    # Rasterize a single page so only one page image per process is ever held in memory
+    images = convert_from_bytes(
+        pdf_bytes, dpi=dpi, first_page=page_number, last_page=page_number, grayscale=grayscale, timeout=remaining
+    )
+    if not images:
+        return ""
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise TimeoutError(f"OCR time budget spent while rasterizing page {page_number}")
+    return pytesseract.image_to_string(images[0], timeout=remaining)
+
+
+def is_scanned_pdf(pdf_bytes):
+    """Cheaply check whether the first pages lack a text layer, so the text extractors can be skipped"""
+    try:
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            for index in range(min(len(pdf), SCANNED_SAMPLE_PAGES)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                char_count = textpage.count_chars()
+                textpage.close()
+                page.close()
+                if char_count >= SCANNED_PAGE_MIN_CHARS:
+                    return False
+            return len(pdf) > 0
+        finally:
+            pdf.close()
+    except Exception as e:
+        logger.warning(f"Could not inspect PDF text layer: {e}")
+        return False
+
+
+def ocr_pdf(pdf_bytes, dpi=OCR_DPI, grayscale=OCR_GRAYSCALE, time_budget=OCR_TIME_BUDGET):
+    """OCR every page in parallel across the process pool, once one of the worker's document slots is free.
+
+    Returns (page_texts, complete): one text per page, "" for pages that failed or missed the time budget,
+    and whether every page was read. Incomplete results must not be cached.
+    """
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    page_count = len(pdf)
+    pdf.close()
+
+    queued = time.monotonic()
+    if not _document_slots.acquire(timeout=OCR_QUEUE_TIMEOUT):
+        logger.warning(f"Gave up on OCR after waiting {OCR_QUEUE_TIMEOUT}s for one of {OCR_MAX_DOCUMENTS} slots")
+        return [""] * page_count, False
+    try:
+        logger.debug(f"Waited {time.monotonic() - queued:.1f}s for an OCR slot")
+        return _ocr_pages(pdf_bytes, page_count, dpi, grayscale, time_budget)
+    finally:
+        _document_slots.release()
+
+
+def _ocr_pages(pdf_bytes, page_count, dpi, grayscale, time_budget):
+    pool = _get_pool()
+    # Wall-clock time, since the pages run in other processes
+    deadline = time.time() + time_budget
+    futures = {
+        pool.submit(_ocr_page, pdf_bytes, page_number, dpi, grayscale, deadline): page_number
+        for page_number in range(1, page_count + 1)
+    }
+    failed = 0
+    page_texts = {}
+    started = time.monotonic()
+    try:
+        for future in as_completed(futures, timeout=time_budget):
+            page_number = futures[future]
+            try:
+                page_texts[page_number] = future.result()
+            except Exception as e:
+                failed += 1
+                logger.error(f"OCR failed on page {page_number}: {e}")
+    except TimeoutError:
+        for future in futures:
+            future.cancel()
+        logger.warning(f"OCR time budget of {time_budget}s exceeded, got {len(page_texts)} of {page_count} pages")
+
+    logger.debug(f"OCR processed {len(page_texts)} pages in {time.monotonic() - started:.1f}s")
+    complete = len(page_texts) == page_count and not failed
+    return [page_texts.get(page_number, "") for page_number in range(1, page_count + 1)], complete
@@ -0,0 +1,103 @@
+import time
+import logging
+import warnings
+from io import BytesIO
+import pdfplumber
+import PyPDF2
+from extraction_cache import get_cached_extraction, store_extraction
+from ocr_engine import is_scanned_pdf, ocr_pdf
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_pages(extract_page, pages):
+    """Run extract_page over pages, returning the texts and a timing record per page"""
+    texts = []
+    timings = []
+    for page_number, page in enumerate(pages, start=1):
+        started = time.perf_counter()
+        try:
+            page_text = extract_page(page) or ""
+        except Exception as e:
+            logger.debug(f"Text extraction failed on page {page_number}: {e}")
+            page_text = ""
+        texts.append(page_text)
+        timings.append({"page": page_number, "chars": len(page_text), "seconds": round(time.perf_counter() - started, 4)})
+    return texts, timings
+
+
+def _pdfplumber_page(page):
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*PDFColorSpace.*")
+        warnings.filterwarnings("ignore", message=".*Cannot convert.*")
+        text = page.extract_text()
+    links = [hyperlink["uri"] for hyperlink in page.hyperlinks if hyperlink.get("uri")]
+    return text, links
+
+
+def _extract_uncached(pdf_bytes):
+    """Return (page_texts, links, timings, extractor, complete); complete is False when OCR skipped pages"""
+    links = []
+    if is_scanned_pdf(pdf_bytes):
+        logger.debug("PDF has no text layer, skipping straight to OCR")
+    else:
+        # One pdfplumber pass yields both the page text and the link annotations
+        try:
+            page_links = []
+
+            def extract_page(page):
+                text, links_on_page = _pdfplumber_page(page)
+                page_links.extend(links_on_page)
+                return text
+
+            with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+                texts, timings = _timed_pages(extract_page, pdf.pages)
+            links = list(dict.fromkeys(page_links))
+            if any(text.strip() for text in texts):
+                return texts, links, timings, "pdfplumber", True
+        except Exception as e:
+            logger.warning(f"pdfplumber extraction failed: {e}")
+
+        try:
+            reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+            texts, timings = _timed_pages(lambda page: page.extract_text(), reader.pages)
+            if any(text.strip() for text in texts):
+                return texts, links, timings, "PyPDF2", True
+        except Exception as e:
+            logger.warning(f"PyPDF2 extraction failed: {e}")
+
+    try:
+        started = time.perf_counter()
+        texts, complete = ocr_pdf(pdf_bytes)
+        # Pages are OCRed concurrently, so only the document total is meaningful here
+        elapsed = round(time.perf_counter() - started, 4)
+        timings = [{"page": page_number, "chars": len(text), "seconds": None} for page_number, text in enumerate(texts, start=1)]
+        logger.debug(f"OCR took {elapsed}s for {len(texts)} pages")
+        if any(text.strip() for text in texts):
+            return texts, links, timings, "tesseract", complete
+    except Exception as e:
+        logger.error(f"OCR processing failed: {e}. Ensure Tesseract OCR and Poppler are installed correctly.")
+        # A missing OCR toolchain or a crash may be fixed by the next attempt, so nothing is cached
+        return [], links, [], None, False
+    return [], links, [], None, True
+
+
+def extract_pdf(pdf_bytes, use_cache=True):
+    """Parse a PDF once from memory, returning {"text", "links", "pages", "extractor"}"""
+    if use_cache:
+        cached = get_cached_extraction(pdf_bytes, "document")
+        if cached is not None:
+            return cached
+
+    texts, links, timings, extractor, complete = _extract_uncached(pdf_bytes)
+    text = "\n".join(page_text for page_text in texts if page_text).strip()
+    if not text and not links:
+        logger.warning("No text or hyperlinks extracted from PDF")
+    else:
+        logger.debug(f"Extracted {len(text)} chars and {len(links)} links from {len(timings)} pages with {extractor}")
+    # The cache never expires, so text from a partial OCR run would otherwise stick to the document for good
+    if use_cache and complete:
+        store_extraction(pdf_bytes, "document", text, links, extractor, pages=timings)
+    elif use_cache:
+        logger.warning("Extraction was incomplete; not caching it")
+    return {"text": text, "links": links, "pages": timings, "extractor": extractor}
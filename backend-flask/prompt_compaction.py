@@ -0,0 +1,102 @@
+import os
+import re
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Budgets for the text pasted into Gemini prompts; 0 leaves the text at its full length
+PROMPT_RESUME_TOKEN_BUDGET = int(os.environ.get("PROMPT_RESUME_TOKEN_BUDGET", 3000))
+PROMPT_JOB_TOKEN_BUDGET = int(os.environ.get("PROMPT_JOB_TOKEN_BUDGET", 1500))
+# Set to 0 to send extracted text exactly as it came out of the PDF
+PROMPT_COMPACTION = os.environ.get("PROMPT_COMPACTION", "1") != "0"
+
+# Gemini averages about four characters of English per token; counting exactly would cost a request
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "[...]"
+
+_URL_PATTERN = re.compile(r"\bhttps?://(?:www\.)?([^\s?#]+)[^\s]*")
+_PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d{1,2}(\s*(of|/)\s*\d{1,2})?)$", re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _is_noise(line):
+    """OCR debris and page numbers: lines with hardly any letters or digits"""
+    if _PAGE_NUMBER_PATTERN.match(line):
+        return True
+    content = line.lstrip("-*•·▪●◦ ")
+    alphanumeric = sum(char.isalnum() for char in content)
+    # Short tokens such as "C++" or "R" are real skills
+    return alphanumeric == 0 or (len(content) >= 4 and alphanumeric / len(content) < 0.4)
+
+
+def normalize_text(text):
+    """Collapse whitespace, shorten URLs, and drop noise and repeated lines such as page headers and footers"""
+    # Query strings and the scheme carry nothing Gemini needs
+    text = _URL_PATTERN.sub(lambda match: match.group(1).rstrip("/"), text)
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line:
+            # Keep single blank lines as section breaks
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        if _is_noise(line):
+            continue
+        key = line.casefold()
+        # Short lines ("Python", "- SQL") legitimately repeat across sections; long ones are headers and footers
+        if len(line) > 20 and key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _cut(section, max_chars):
+    """Shorten a section to max_chars, preferring to end at a line or sentence boundary"""
+    if len(section) <= max_chars:
+        return section
+    cut = section[:max(0, max_chars - len(TRUNCATION_MARKER) - 1)]
+    boundary = max(cut.rfind("\n"), cut.rfind(". "))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary + 1]
+    return f"{cut.rstrip()} {TRUNCATION_MARKER}" if cut.strip() else ""
+
+
+def truncate_to_budget(text, max_tokens):
+    """Fit text into max_tokens by shortening its longest sections first, so every section keeps its beginning"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if max_tokens <= 0 or len(text) <= max_chars:
+        return text
+    sections = text.split("\n\n")
+    # Water-filling: sections under the fair share stay whole and leave their unused share to the longer ones
+    budget = max_chars - 2 * (len(sections) - 1)
+    remaining = sorted(range(len(sections)), key=lambda index: len(sections[index]))
+    limits = {}
+    while remaining:
+        share = budget // len(remaining)
+        index = remaining[0]
+        if len(sections[index]) > share:
+            for index in remaining:
+                limits[index] = share
+            break
+        limits[index] = len(sections[index])
+        budget -= len(sections[index])
+        remaining.pop(0)
+    return "\n\n".join(section for section in (_cut(sections[i], limits[i]) for i in range(len(sections))) if section)
+
+
+def compact_text(text, max_tokens, label="text"):
+    """Normalize text and fit it into max_tokens for a prompt, logging the token counts before and after"""
+    if not text or not PROMPT_COMPACTION:
+        return text
+    before = estimate_tokens(text)
+    compacted = truncate_to_budget(normalize_text(text), max_tokens)
+    after = estimate_tokens(compacted)
+    logger.info(f"Compacted {label} from ~{before} to ~{after} tokens (budget {max_tokens or 'unlimited'})")
+    return compacted
@@ -0,0 +1,81 @@
+import os
+import logging
+import threading
+from fpdf import FPDF
+from http_client import http_get
+
+logger = logging.getLogger(__name__)
+
+REPORT_ASSETS_DIR = os.environ.get(
+    "REPORT_ASSETS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "report"),
+)
+# Assets are bundled in REPORT_ASSETS_DIR, so reports render offline. Set to 1 to download any that are
+# missing (e.g. with a custom REPORT_ASSETS_DIR) from REMOTE_ASSETS on first load
+REPORT_ASSET_WARMUP = os.environ.get("REPORT_ASSET_WARMUP", "0") == "1"
+
+# Fallback sources for assets missing from REPORT_ASSETS_DIR, used only with REPORT_ASSET_WARMUP
+REMOTE_ASSETS = {
+    "logo.png": "https://cdn-icons-png.flaticon.com/512/3891/3891670.png",
+}
+
+
+class ReportAssets:
+    """Report images parsed once per worker and handed to every PDFReport from memory"""
+
+    def __init__(self, assets_dir):
+        self.assets_dir = assets_dir
+        self._images = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _warm_up(self, name, url):
+        path = os.path.join(self.assets_dir, name)
+        try:
+            response = http_get(url, timeout=10)
+            if response.status_code != 200:
+                logger.warning(f"Could not download report asset {name}: Status {response.status_code}")
+                return
+            os.makedirs(self.assets_dir, exist_ok=True)
+            # Write then rename so concurrently starting workers never read a partial file
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as asset_file:
+                asset_file.write(response.content)
+            os.replace(temp_path, path)
+            logger.debug(f"Downloaded report asset {name} to {path}")
+        except Exception as e:
+            logger.warning(f"Could not download report asset {name}: {e}")
+
+    def load(self, warmup=REPORT_ASSET_WARMUP):
+        with self._lock:
+            if self._loaded:
+                return
+            for name, url in REMOTE_ASSETS.items():
+                path = os.path.join(self.assets_dir, name)
+                if not os.path.exists(path) and warmup:
+                    self._warm_up(name, url)
+                if not os.path.exists(path):
+                    logger.warning(f"Report asset {name} is not available; reports will render without it")
+                    continue
+                try:
+                    # Reuse FPDF's own PNG parser so the result can be registered on any document
+                    self._images[name] = FPDF()._parsepng(path)
+                except Exception as e:
+                    logger.error(f"Failed to load report asset {name}: {e}")
+            self._loaded = True
+
+    def image(self, pdf, name, x=None, y=None, w=0, h=0):
+        """Place a preloaded image on the page; returns False if the asset is unavailable"""
+        self.load()
+        info = self._images.get(name)
+        if info is None:
+            return False
+        key = f"asset:{name}"
+        if key not in pdf.images:
+            # FPDF drops the image data from its own copy once the document is written
+            pdf.images[key] = dict(info, i=len(pdf.images) + 1)
+        pdf.image(key, x=x, y=y, w=w, h=h)
+        return True
+
+
+report_assets = ReportAssets(REPORT_ASSETS_DIR)
@@ -0,0 +1,154 @@
+import os
+import json
+import logging
+import threading
+import numpy as np
+from filelock import FileLock
+from embedding_scorer import get_embedding_scorer
+
+logger = logging.getLogger(__name__)
+
+RESUME_INDEX_DIR = os.environ.get(
+    "RESUME_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".resume_index"),
+)
+
+
+class ResumeIndex:
+    """Append-only matrix of resume embeddings in a memory-mapped float32 file, keyed by resume URL.
+
+    meta.json records how many rows and id bytes have been fully written; anything past that is a torn append
+    and is ignored by readers and cut off by the next writer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.ids_path = os.path.join(path, "ids.jsonl")
+        self.meta_path = os.path.join(path, "meta.json")
+        self._file_lock = FileLock(os.path.join(path, "index.lock"))
+        self._lock = threading.Lock()
+        self._loaded_size = None
+        self._matrix = None
+        self._rows = {}
+        self._dim = None
+
+    def add(self, resume_id, vector):
+        """Append a vector; re-adding a resume supersedes its earlier row"""
+        vector = np.asarray(vector, dtype=np.float32)
+        os.makedirs(self.path, exist_ok=True)
+        # Several gunicorn workers append to the same files
+        with self._file_lock:
+            meta = self._read_meta()
+            if meta is None:
+                meta = {"dim": int(vector.shape[0]), "model": get_embedding_scorer().model_name}
+                with open(self.meta_path, "w") as meta_file:
+                    json.dump(meta, meta_file)
+            if meta["dim"] != vector.shape[0]:
+                raise ValueError(f"Vector has {vector.shape[0]} dimensions, index expects {meta['dim']}")
+            rows, ids_bytes = self._committed(meta)
+            line = (json.dumps(resume_id) + "\n").encode("utf-8")
+            with open(self.vectors_path, "ab") as vectors_file:
+                vectors_file.truncate(rows * meta["dim"] * 4)
+                vectors_file.write(vector.tobytes())
+            with open(self.ids_path, "ab") as ids_file:
+                ids_file.truncate(ids_bytes)
+                ids_file.write(line)
+            self._write_meta({**meta, "rows": rows + 1, "ids_bytes": ids_bytes + len(line)})
+        logger.debug(f"Indexed resume {resume_id}")
+
+    def _read_meta(self):
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path) as meta_file:
+            return json.load(meta_file)
+
+    def _write_meta(self, meta):
+        # Replaced in one step, so readers never see a half-written row count
+        temp_path = f"{self.meta_path}.tmp"
+        with open(temp_path, "w") as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(temp_path, self.meta_path)
+
+    def _committed(self, meta):
+        """Return (rows, id bytes) known to be complete, working them out for indexes written before meta kept them"""
+        if "rows" in meta:
+            return meta["rows"], meta["ids_bytes"]
+        if not os.path.exists(self.ids_path):
+            return 0, 0
+        vector_rows = os.path.getsize(self.vectors_path) // (meta["dim"] * 4) if os.path.exists(self.vectors_path) else 0
+        rows = ids_bytes = 0
+        with open(self.ids_path, "rb") as ids_file:
+            for line in ids_file:
+                if rows == vector_rows or not line.endswith(b"\n"):
+                    break
+                rows += 1
+                ids_bytes += len(line)
+        return rows, ids_bytes
+
+    def _refresh(self):
+        # Other workers may have appended rows since the matrix was last mapped
+        with self._lock:
+            meta = self._read_meta()
+            if meta is None or (meta.get("rows"), meta.get("ids_bytes")) == self._loaded_size:
+                return
+            with self._file_lock:
+                meta = self._read_meta()
+                row_count, ids_bytes = self._committed(meta)
+                if (row_count, ids_bytes) == self._loaded_size:
+                    return
+                self._dim = meta["dim"]
+                with open(self.ids_path, "rb") as ids_file:
+                    ids = [json.loads(line) for line in ids_file.read(ids_bytes).splitlines()]
+                if row_count:
+                    self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(row_count, self._dim))
+                else:
+                    self._matrix = np.zeros((0, self._dim), dtype=np.float32)
+                self._rows = {resume_id: row for row, resume_id in enumerate(ids)}
+                self._loaded_size = (row_count, ids_bytes)
+            logger.debug(f"Loaded resume index with {len(self._rows)} resumes")
+
+    def missing(self, resume_ids):
+        self._refresh()
+        return [resume_id for resume_id in resume_ids if resume_id not in self._rows]
+
+    def get_vector(self, resume_id):
+        self._refresh()
+        row = self._rows.get(resume_id)
+        return None if row is None else np.array(self._matrix[row])
+
+    def query(self, vector, top_k=10, resume_ids=None):
+        """Return the top_k (resume_id, cosine similarity) pairs, optionally restricted to resume_ids"""
+        self._refresh()
+        if not self._rows:
+            return []
+        candidates = self._rows if resume_ids is None else {
+            resume_id: self._rows[resume_id] for resume_id in resume_ids if resume_id in self._rows
+        }
+        if not candidates:
+            return []
+        ids = list(candidates)
+        similarities = self._matrix[np.fromiter(candidates.values(), dtype=np.int64)] @ np.asarray(vector, dtype=np.float32)
+        top_k = min(top_k, len(ids))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-similarities, top_k - 1)[:top_k]
+        top = top[np.argsort(-similarities[top])]
+        return [(ids[i], float(similarities[i])) for i in top]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_resume_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ResumeIndex(RESUME_INDEX_DIR)
+        return _index
+
+
+def index_resume(resume_id, resume_text):
+    """Embed a resume once and add it to the shared index"""
+    get_resume_index().add(resume_id, get_embedding_scorer().embed_text(resume_text))
@@ -1,12 +1,15 @@
+import os
 import sys
 import json
-import pdfplumber
+
+# Share the Flask service's extractor (and its cache) instead of parsing the PDF separately
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_extraction import extract_pdf
 
 def extract_text_from_pdf(file_path):
     """Extract text from a PDF file."""
-    with pdfplumber.open(file_path) as pdf:
-        text = ''.join([page.extract_text() for page in pdf.pages if page.extract_text()])
-    return text.strip()
+    with open(file_path, 'rb') as file:
+        return extract_pdf(file.read())["text"]
 
 if __name__ == "__main__":
     file_path = sys.argv[1]  # Get file path from Node.js call
@@ -65,54 +65,46 @@ router.get('/api/jobs/:id/matches', authMiddleware, async (req, res) => {
       department: { $in: job.target_departments }
     }).select('name email department year resumeFilePath skills');
 
-    // Call Flask server for match scores
-    const matches = await Promise.all(students.map(async (student) => {
+    // Rank the selected students' resumes against the job with one query to the Flask resume index
+    const matchScores = {};
+    const resumeFilePaths = students.map((student) => student.resumeFilePath).filter(Boolean);
+    if (resumeFilePaths.length > 0) {
       try {
-        const flaskResponse = await axios.post('https://careercatalyst-flask.onrender.com/match_resume_job', {
-          resumeFilePath: student.resumeFilePath,
+        const flaskResponse = await axios.post('https://careercatalyst-flask.onrender.com/resume_index/query', {
+          resumeFilePaths,
           jobDescription: job.description,
-          jobRole: job.title
+          jobRole: job.title,
+          indexMissing: true
         }, {
           headers: { 'Content-Type': 'application/json' }
         });
 
-        const matchScore = flaskResponse.data.match_score || 0;
-
-        return {
-          student_id: student._id,
-          job_id: job._id,
-          match_score: matchScore,
-          student: {
-            _id: student._id,
-            name: student.name,
-            email: student.email,
-            department: student.department,
-            year: student.year,
-            resume_url: `${student.resumeFilePath}`,
-            skills: student.skills || [],
-            created_at: student.created_at
-          },
-          job
-        };
+        for (const match of flaskResponse.data.matches || []) {
+          matchScores[match.resumeFilePath] = match.match_score || 0;
+        }
+        for (const resumeFilePath of flaskResponse.data.missing || []) {
+          console.error(`Error fetching match score for resume ${resumeFilePath}: resume could not be indexed`);
+        }
       } catch (error) {
-        console.error(`Error fetching match score for student ${student._id}:`, error.message);
-        return {
-          student_id: student._id,
-          job_id: job._id,
-          match_score: 0,
-          student: {
-            _id: student._id,
-            name: student.name,
-            email: student.email,
-            department: student.department,
-            year: student.year,
-            resume_url: `${student.resumeFilePath}`,
-            skills: student.skills || [],
-            created_at: student.created_at
-          },
-          job
-        };
+        console.error(`Error fetching match scores for job ${job._id}:`, error.message);
       }
+    }
+
+    const matches = students.map((student) => ({
+      student_id: student._id,
+      job_id: job._id,
+      match_score: matchScores[student.resumeFilePath] || 0,
+      student: {
+        _id: student._id,
+        name: student.name,
+        email: student.email,
+        department: student.department,
+        year: student.year,
+        resume_url: `${student.resumeFilePath}`,
+        skills: student.skills || [],
+        created_at: student.created_at
+      },
+      job
     }));
 
     res.json({ success: true, data: matches });